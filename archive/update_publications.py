@@ -5,6 +5,15 @@ Script to update publications in index.html from publications.txt
 
 import re
 import os
+import sys
+import bisect
+
+try:
+    from build_cache import write_file_atomic
+except ImportError:
+    # Run as `python archive/update_publications.py`: the helpers live in the repo root
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from build_cache import write_file_atomic
 
 def parse_publication(publication_text):
     """
@@ -155,72 +164,167 @@ def parse_existing_publication_html(li_html):
         return int(year_match.group(1))
     return 0
 
-def update_html_file(html_file, publications_list, existing_publications_html):
+def find_publication_items(content):
     """
-    Update the HTML file with new publications list, preserving existing ones and maintaining chronological order
+    Locate the publications list and every <li> inside it
+    Returns (ul_start, ul_end, items) where items is a list of
+    (year, line_start, line_end) offsets, or None if the list is missing
     """
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    ul_start = content.find('<ul id="publications-list">')
+    if ul_start == -1:
+        return None
     
-    # Find the publications list section
-    start_pattern = r'<ul id="publications-list">'
-    end_pattern = r'</ul>'
+    ul_end = content.find('</ul>', ul_start)
+    if ul_end == -1:
+        return None
+    
+    items = []
+    li_pattern = re.compile(r'<li[^>]*>.*?</li>', re.DOTALL)
+    for match in li_pattern.finditer(content, ul_start, ul_end):
+        # Offsets cover the whole source line so indentation and newlines are kept intact
+        line_start = content.rfind('\n', 0, match.start()) + 1
+        line_end = content.find('\n', match.end())
+        line_end = ul_end if line_end == -1 or line_end > ul_end else line_end + 1
+        year = parse_existing_publication_html(match.group(0))
+        items.append((year, line_start, line_end))
+    
+    return ul_start, ul_end, items
+
+def parse_publication_li(li_html):
+    """
+    Parse a <li> produced by generate_html_li back into a publication dict
+    (the inverse of generate_html_li, used by the feed/metadata builders)
+    """
+    li_match = re.match(r'\s*<li[^>]*>(.*?)</li>\s*$', li_html, re.DOTALL)
+    inner = li_match.group(1) if li_match else li_html
+    
+    year_match = re.search(r'\((\d{4})\)', inner)
+    if not year_match:
+        return None
+    
+    link_match = re.search(r'<a([^>]*)>(.*?)</a>', inner[year_match.end():], re.DOTALL)
+    if not link_match:
+        return None
+    href_match = re.search(r'href="([^"]*)"', link_match.group(1))
+    href = href_match.group(1) if href_match else None
+    title = link_match.group(2)
+    rest = inner[year_match.end() + link_match.end():]
+    
+    journal_match = re.search(r'<em>(.*?)</em>(.*)$', rest, re.DOTALL)
+    journal = journal_match.group(1).strip() if journal_match else ''
+    tail = journal_match.group(2).strip().rstrip('.') if journal_match else ''
+    
+    # Tail looks like ", 13(3), 81" / ", 6, 276" / ""
+    volume, issue, pages = '', '', ''
+    tail_match = re.match(r',\s*([^,(]+?)(?:\(([^)]*)\))?(?:,\s*(.+))?$', tail)
+    if tail_match:
+        volume = tail_match.group(1).strip()
+        issue = tail_match.group(2) or ''
+        pages = (tail_match.group(3) or '').strip()
+    
+    doi_url = href if href and href != '#' else None
+    pub_type = 'thesis' if 'thesis' in journal.lower() else 'journal'
+    
+    return {
+        'authors': inner[:year_match.start()].strip(),
+        'year': int(year_match.group(1)),
+        'title': title.strip(),
+        'journal': journal,
+        'volume': volume,
+        'issue': issue,
+        'pages': pages,
+        'doi_url': doi_url,
+        'type': pub_type
+    }
+
+def extract_publication_records(html_content):
+    """
+    Extract structured publication records from the publications list, in page order
+    """
+    located = find_publication_items(html_content)
+    if located is None:
+        return []
+    
+    records = []
+    for _, line_start, line_end in located[2]:
+        record = parse_publication_li(html_content[line_start:line_end])
+        if record:
+            records.append(record)
+    return records
+
+def update_html_file(html_file, publications_list, existing_publications_html=None):
+    """
+    Insert new publications into the HTML file in chronological order (newest first)
+    
+    Existing entries are left untouched: the insertion point of each new <li> is
+    found with bisect against the years already in the list and only those
+    positions are spliced, so the diff contains just the added lines.
+    `existing_publications_html` is accepted for backwards compatibility and ignored.
+    """
+    with open(html_file, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
     
-    start_match = re.search(start_pattern, content)
-    if not start_match:
+    located = find_publication_items(content)
+    if located is None:
         print("Error: Could not find publications list in HTML file")
         return False
     
-    # Find the end of the publications list
-    start_pos = start_match.start()
-    ul_start = content.find('<ul id="publications-list">', start_pos)
-    ul_end = content.find('</ul>', ul_start)
+    ul_start, ul_end, items = located
     
-    if ul_start == -1 or ul_end == -1:
-        print("Error: Could not find publications list boundaries")
-        return False
+    if not publications_list:
+        return True
     
-    # Parse existing publications and extract their HTML with years
-    existing_publications_with_years = []
-    if existing_publications_html:
-        # Split existing HTML into individual <li> elements
-        li_pattern = r'<li[^>]*>.*?</li>'
-        existing_li_matches = re.findall(li_pattern, existing_publications_html, re.DOTALL)
-        
-        for li_html in existing_li_matches:
-            year = parse_existing_publication_html(li_html)
-            existing_publications_with_years.append((year, li_html))
-    
-    # Combine all publications (existing + new) and sort by year (newest first)
-    all_publications = []
+    # Reuse the indentation of the existing entries (or nest one level under <ul>)
+    if items:
+        first_line_start = items[0][1]
+        indent = re.match(r'[ \t]*', content[first_line_start:]).group(0)
+    else:
+        ul_line_start = content.rfind('\n', 0, ul_start) + 1
+        indent = re.match(r'[ \t]*', content[ul_line_start:]).group(0) + '    '
     
-    # Add existing publications
-    for year, li_html in existing_publications_with_years:
-        all_publications.append((year, li_html))
+    # New lines follow the file's own line endings (it is read with newline='')
+    eol = '\r\n' if '\r\n' in content else '\n'
     
-    # Add new publications
+    # The list is newest first, so bisect over negated years to get an ascending key
+    keys = [-year for year, _, _ in items]
+    insertions = {}
     for pub_html in publications_list:
-        # Extract year from new publication HTML
         year = parse_existing_publication_html(pub_html)
-        all_publications.append((year, pub_html))
-    
-    # Sort all publications by year (newest first)
-    all_publications.sort(key=lambda x: x[0], reverse=True)
-    
-    # Generate the new publications HTML
-    new_publications_html = '<ul id="publications-list">\n'
-    
-    for year, li_html in all_publications:
-        new_publications_html += f'                    {li_html}\n'
-    
-    new_publications_html += '                </ul>'
-    
-    # Replace the old publications list with the new one
-    new_content = content[:ul_start] + new_publications_html + content[ul_end + 5:]
+        index = bisect.bisect_right(keys, -year)
+        insertions.setdefault(index, []).append((year, pub_html))
+    
+    # Entries appended at the end go after the last <li> line, or right after <ul> when empty
+    tail_prefix = ''
+    tail_suffix = ''
+    if items:
+        tail_offset = items[-1][2]
+    else:
+        tail_offset = content.find('>', ul_start) + 1
+        newline = content.find('\n', tail_offset)
+        if newline != -1 and newline < ul_end:
+            tail_offset = newline + 1
+        else:
+            # <ul ...></ul> on one line: put the closing tag back on its own line
+            ul_line_start = content.rfind('\n', 0, ul_start) + 1
+            tail_prefix = eol
+            tail_suffix = re.match(r'[ \t]*', content[ul_line_start:]).group(0)
+    
+    pieces = []
+    cursor = 0
+    for index in sorted(insertions):
+        new_items = sorted(insertions[index], key=lambda x: x[0], reverse=True)
+        block = ''.join(f'{indent}{li_html}{eol}' for _, li_html in new_items)
+        if index < len(items):
+            offset = items[index][1]
+        else:
+            offset = tail_offset
+            block = tail_prefix + block + tail_suffix
+        pieces.append(content[cursor:offset])
+        pieces.append(block)
+        cursor = offset
+    pieces.append(content[cursor:])
     
-    # Write the updated content back to the file
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    write_file_atomic(html_file, ''.join(pieces))
     
     return True
 
@@ -249,14 +353,6 @@ def main():
     existing_titles = extract_existing_publications(html_content)
     print(f"Found {len(existing_titles)} existing publications in HTML")
     
-    # Extract existing publications HTML to preserve them
-    existing_publications_html = ""
-    ul_start = html_content.find('<ul id="publications-list">')
-    if ul_start != -1:
-        ul_end = html_content.find('</ul>', ul_start)
-        if ul_end != -1:
-            existing_publications_html = html_content[ul_start + len('<ul id="publications-list">'):ul_end]
-    
     print("Reading publications from publications.txt...")
     
     with open(publications_file, 'r', encoding='utf-8') as f:
@@ -288,13 +384,6 @@ def main():
     
     if new_publications_count == 0:
         print("\nNo new publications to add. All publications from publications.txt already exist in HTML.")
-        print("Re-sorting existing publications by year...")
-        
-        # Still need to re-sort existing publications
-        if update_html_file(html_file, [], existing_publications_html):
-            print(f"Successfully re-sorted publications in {html_file}")
-        else:
-            print("Failed to re-sort HTML file")
         return
     
     # Sort new publications by year (newest first)
@@ -310,7 +399,7 @@ def main():
     print(f"Generated {len(html_items)} new HTML list items")
     
     # Update the HTML file
-    if update_html_file(html_file, html_items, existing_publications_html):
+    if update_html_file(html_file, html_items):
         print(f"Successfully updated {html_file} with {new_publications_count} new publications")
     else:
         print("Failed to update HTML file")
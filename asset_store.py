@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Script to build a content-addressed copy of the site in dist/
+
+Every asset is hashed (in parallel) and stored once under dist/assets/ with
+its content hash as the file name, so exact duplicates collapse to one blob
+and the files can be served with far-future cache headers. References in the
+pages and in the CSS they load are rewritten to the hashed names. The report
+lists reclaimed bytes, stale files and assets nothing references.
+
+dist/ is a local build and report; the site itself is still published
+from the repository branch, so nothing here changes what is deployed.
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+from urllib.parse import unquote
+
+from build_cache import CACHE_DIR, file_digest, text_digest, open_atomic, write_file_atomic
+from service_worker import write_service_worker, write_if_changed, add_registration, SW_FILE, PRECACHE_MANIFEST
+
+SITE_URL = "https://gisynw.github.io"
+DIST_DIR = 'dist'
+ASSET_DIRS = ['Images', 'css_self', 'js_self', 'fonts/subset', 'medium', 'materials', 'archive/css', 'archive/js']
+PAGES = ['index.html', 'cv.html']
+EXTRA_FILES = ['sitemap.xml', 'publications.xml']
+HASH_CACHE_FILE = os.path.join(CACHE_DIR, 'file_hashes.json')
+
+# Only these are renamed by content hash; documents such as PDFs keep their names
+HASHED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico',
+                     '.css', '.js', '.woff', '.woff2', '.ttf', '.eot'}
+STALE_FILES = {'thumbs.db', '.ds_store', 'desktop.ini'}
+# Build metadata that lives next to assets but is never served
+IGNORED_FILES = {'manifest.json'}
+
+HTML_REF = re.compile(r'\b(src|href|data-src|data-full|poster)="([^"]*)"')
+HTML_SRCSET = re.compile(r'\b(srcset|data-srcset)="([^"]*)"')
+CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+INLINE_STYLE = re.compile(r'(<style\b[^>]*>)(.*?)(</style>)', re.IGNORECASE | re.DOTALL)
+
+def scan_assets(asset_dirs=ASSET_DIRS):
+    """
+    Return (assets, stale): every file under the asset directories, minus OS junk files
+    """
+    assets, stale = [], []
+    for directory in asset_dirs:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if name in IGNORED_FILES:
+                    continue
+                path = os.path.join(root, name).replace(os.sep, '/')
+                (stale if name.lower() in STALE_FILES else assets).append(path)
+    return assets, stale
+
+def hash_files(paths, workers=None, cache_file=HASH_CACHE_FILE):
+    """
+    Hash files in parallel (hashlib releases the GIL on large buffers); files whose
+    size and mtime match the previous build reuse the hash recorded in cache_file
+    """
+    cached = {}
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+
+    digests, changed, stats = {}, [], {}
+    for path in paths:
+        stat = os.stat(path)
+        stats[path] = [stat.st_size, stat.st_mtime_ns]
+        entry = cached.get(path)
+        if entry and entry[:2] == stats[path]:
+            digests[path] = entry[2]
+        else:
+            changed.append(path)
+
+    if changed:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as pool:
+            digests.update(zip(changed, pool.map(file_digest, changed)))
+
+    if cache_file and (changed or set(cached) != set(paths)):
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        write_file_atomic(cache_file, json.dumps({path: stats[path] + [digests[path]] for path in paths},
+                                                 indent=0, sort_keys=True) + '\n')
+    return digests
+
+def resolve_reference(ref, base_dir, root=''):
+    """
+    Map a reference found in a page or stylesheet to a repo-relative path
+    (site-absolute references resolve against `root`)
+    Returns (path, suffix) or None for external/data/anchor references
+    """
+    if ref.startswith(SITE_URL + '/'):
+        ref = ref[len(SITE_URL):]
+    elif re.match(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', ref, re.IGNORECASE) or not ref:
+        return None
+
+    match = re.match(r'^([^?#]*)(.*)$', ref)
+    path, suffix = unquote(match.group(1)), match.group(2)
+    if path.startswith('/'):
+        path = os.path.join(root, path.lstrip('/'))
+    else:
+        path = os.path.join(base_dir, path)
+    return os.path.normpath(path).replace(os.sep, '/'), suffix
+
+class AssetStore:
+    """
+    Maps source paths to content-addressed names and copies each unique blob once
+    """
+
+    def __init__(self, digests, dist_dir=DIST_DIR):
+        self.digests = digests
+        self.dist_dir = dist_dir
+        self.mapping = {}
+        self.revisions = {}
+        self.referenced = set()
+        self.missing = set()
+
+    def blob_name(self, path, digest):
+        return f"assets/{digest[:16]}{os.path.splitext(path)[1].lower()}"
+
+    def store(self, path, content=None):
+        """
+        Store one asset (or rewritten content for it) and return its dist-relative name
+        """
+        if path in self.mapping:
+            return self.mapping[path]
+
+        if os.path.splitext(path)[1].lower() not in HASHED_EXTENSIONS:
+            name = path
+            target = os.path.join(self.dist_dir, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Kept between builds, so refresh the copy when the source has changed
+            if not os.path.exists(target) or os.path.getsize(target) != os.path.getsize(path) \
+                    or int(os.path.getmtime(target)) != int(os.path.getmtime(path)):
+                shutil.copy2(path, target)
+        else:
+            digest = text_digest(content) if content is not None else self.digests[path]
+            name = self.blob_name(path, digest)
+            target = os.path.join(self.dist_dir, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if not os.path.exists(target):
+                if content is not None:
+                    with open_atomic(target, 'wb') as f:
+                        f.write(content)
+                else:
+                    # A copy, not a hard link: editing a source in place must never change a published blob
+                    shutil.copy2(path, target)
+
+        self.mapping[path] = name
+        self.revisions[name] = digest if os.path.splitext(path)[1].lower() in HASHED_EXTENSIONS else self.digests[path]
+        return name
+
+    def rewrite_reference(self, ref, base_dir, from_dir=''):
+        resolved = resolve_reference(ref, base_dir)
+        if resolved is None:
+            return ref
+        path, suffix = resolved
+        if path.endswith('.html') or path in EXTRA_FILES:
+            return ref
+        if not os.path.isfile(path):
+            # Extension-less links (e.g. "DSGA/") are sibling GitHub Pages projects, not files here
+            if os.path.splitext(path)[1]:
+                self.missing.add(path)
+            return ref
+
+        self.referenced.add(path)
+        if path.endswith('.css'):
+            name = self.store_css(path)
+        else:
+            name = self.store(path)
+        return os.path.relpath(name, from_dir or '.').replace(os.sep, '/') + suffix
+
+    def store_css(self, path):
+        """
+        Rewrite url() references inside a stylesheet, then store the rewritten file
+        """
+        if path in self.mapping:
+            return self.mapping[path]
+        with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+            css = f.read()
+        base_dir = os.path.dirname(path)
+        css = CSS_URL.sub(
+            lambda m: f'url({m.group(1)}{self.rewrite_reference(m.group(2), base_dir, "assets")}{m.group(1)})',
+            css
+        )
+        return self.store(path, css.encode('utf-8', errors='surrogateescape'))
+
+    def rewrite_html(self, html, base_dir=''):
+        def attr(match):
+            return f'{match.group(1)}="{self.rewrite_reference(match.group(2), base_dir)}"'
+
+        def srcset(match):
+            entries = []
+            for entry in match.group(2).split(','):
+                parts = entry.strip().split(None, 1)
+                if parts:
+                    parts[0] = self.rewrite_reference(parts[0], base_dir)
+                    entries.append(' '.join(parts))
+            return f'{match.group(1)}="{", ".join(entries)}"'
+
+        def style(match):
+            css = CSS_URL.sub(
+                lambda m: f'url({m.group(1)}{self.rewrite_reference(m.group(2), base_dir)}{m.group(1)})',
+                match.group(2)
+            )
+            return match.group(1) + css + match.group(3)
+
+        html = HTML_REF.sub(attr, html)
+        html = INLINE_STYLE.sub(style, html)
+        return HTML_SRCSET.sub(srcset, html)
+
+def prune_dist(dist_dir, produced):
+    """
+    Delete files in dist_dir that the current build did not produce
+    """
+    removed = []
+    for root, dirs, files in os.walk(dist_dir, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.relpath(path, dist_dir).replace(os.sep, '/') not in produced:
+                os.remove(path)
+                removed.append(path)
+        if root != dist_dir and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+def build_dist(pages=PAGES, dist_dir=DIST_DIR):
+    """
+    Build dist/ and return a report dict
+    """
+    assets, stale = scan_assets()
+    digests = hash_files(assets)
+
+    # dist/ is updated in place: blobs already present are kept and only
+    # files this build no longer produces are removed at the end
+    os.makedirs(dist_dir, exist_ok=True)
+
+    store = AssetStore(digests, dist_dir)
+    precache = {}
+    for page in pages:
+        if not os.path.exists(page):
+            continue
+        with open(page, 'r', encoding='utf-8') as f:
+            html = f.read()
+        html = add_registration(store.rewrite_html(html))
+        write_if_changed(os.path.join(dist_dir, page), html)
+        precache[page] = (text_digest(html), len(html.encode('utf-8')), False)
+
+    for extra in EXTRA_FILES:
+        if os.path.exists(extra):
+            shutil.copy2(extra, os.path.join(dist_dir, extra))
+
+    # Hashed names never change content, so they can be cached forever; the
+    # service worker and its manifest must always be revalidated. GitHub Pages
+    # ignores _headers; it only applies if dist/ is served by a host that reads it
+    write_if_changed(os.path.join(dist_dir, '_headers'),
+                     "/assets/*\n  Cache-Control: public, max-age=31536000, immutable\n"
+                     f"/{SW_FILE}\n  Cache-Control: no-cache\n"
+                     f"/{PRECACHE_MANIFEST}\n  Cache-Control: no-cache\n")
+    write_if_changed(os.path.join(dist_dir, 'asset-manifest.json'),
+                     json.dumps(store.mapping, indent=2, sort_keys=True) + '\n')
+
+    for name, revision in store.revisions.items():
+        precache[name] = (revision, os.path.getsize(os.path.join(dist_dir, name)), name.startswith('assets/'))
+    sw_manifest = write_service_worker(dist_dir, precache)
+
+    produced = set(precache) | set(EXTRA_FILES) | {'_headers', 'asset-manifest.json', SW_FILE, PRECACHE_MANIFEST}
+    removed = prune_dist(dist_dir, produced)
+
+    groups = {}
+    for path in assets:
+        groups.setdefault(digests[path], []).append(path)
+    duplicates = [paths for paths in groups.values() if len(paths) > 1]
+    reclaimed = sum(os.path.getsize(paths[0]) * (len(paths) - 1) for paths in duplicates)
+
+    return {
+        'assets': assets,
+        'unique': len(groups),
+        'duplicates': duplicates,
+        'reclaimed': reclaimed,
+        'stale': stale,
+        'unused': [path for path in assets if path not in store.referenced],
+        'missing': sorted(store.missing),
+        'stored': len(set(store.mapping.values())),
+        'precache': sw_manifest,
+        'removed': removed
+    }
+
+def main(strict=False):
+    if not os.path.exists('index.html'):
+        print("Error: index.html not found!")
+        return
+
+    print(f"Building content-addressed site in {DIST_DIR}/...")
+    report = build_dist()
+
+    print(f"Hashed {len(report['assets'])} assets: {report['unique']} unique, "
+          f"{report['stored']} stored in {DIST_DIR}/")
+    files = report['precache']['files']
+    precached = [entry for entry in files if entry['precache']]
+    print(f"Service worker {report['precache']['version']}: {len(precached)} files precached "
+          f"({sum(entry['size'] for entry in precached) / 1024:.0f} KB), "
+          f"{len(files) - len(precached)} cached on first use")
+    if report['removed']:
+        print(f"Removed {len(report['removed'])} files from the previous build")
+
+    if report['duplicates']:
+        print(f"\nDuplicate groups ({len(report['duplicates'])}), {report['reclaimed'] / 1024:.0f} KB reclaimed:")
+        for paths in report['duplicates']:
+            print(f"  {os.path.getsize(paths[0]) // 1024:>6} KB  " + ' = '.join(paths))
+
+    if report['stale']:
+        stale_bytes = sum(os.path.getsize(path) for path in report['stale'])
+        print(f"\nStale OS files ({stale_bytes / 1024:.0f} KB, safe to delete):")
+        for path in report['stale']:
+            print(f"  {path}")
+
+    if report['unused']:
+        unused_bytes = sum(os.path.getsize(path) for path in report['unused'])
+        print(f"\nUnreferenced assets ({len(report['unused'])}, {unused_bytes / 1024:.0f} KB):")
+        for path in report['unused']:
+            print(f"  {path}")
+
+    if report['missing']:
+        print("\nMissing files referenced by the pages:")
+        for path in report['missing']:
+            print(f"  {path}")
+
+    print(f"\n✅ Built {DIST_DIR}/")
+    if strict and report['missing']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(strict='--strict' in sys.argv[1:])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for site_cli.py based on `python -X importtime`
+
+Runs each scenario several times, reports the median wall time and the
+heaviest top-level imports, and exits non-zero if a scenario is over budget.
+The scenarios run in a scratch copy of the site, so warming the build caches
+never rewrites files in the working tree.
+
+    python bench_startup.py            # default scenarios, 100 ms budget
+    python bench_startup.py --budget 60 --runs 9
+"""
+
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+SCENARIOS = [
+    ['--help'],
+    ['feeds'],
+    ['cv'],
+    ['thumbnails'],
+]
+
+# Not needed to run the scenarios; the build cache is left out so the warm-up fills a fresh one
+SKIP_COPY = shutil.ignore_patterns('.git', 'dist', '.build_cache', '__pycache__', '*.pyc')
+
+HEAVY_MODULES = ['bs4', 'scholarly', 'numpy', 'PIL', 'requests', 'fontTools']
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def parse_importtime(stderr):
+    """
+    Return {module: cumulative microseconds} for top-level imports
+    """
+    top_level = {}
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+    return top_level
+
+def run_scenario(args, runs, workdir):
+    """
+    Run one scenario in workdir; the first (warm-up) run fills the build caches and is discarded
+    """
+    command = [sys.executable, '-X', 'importtime', 'site_cli.py'] + args
+    subprocess.run(command, capture_output=True, text=True, cwd=workdir)
+
+    timings = []
+    imports = {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, cwd=workdir)
+        timings.append((time.perf_counter() - started) * 1000)
+        imports = parse_importtime(result.stderr)
+    return median(timings), imports
+
+def report_scenario(scenario, args, workdir):
+    """
+    Print one scenario's timing line; returns True if it is over budget
+    """
+    wall_ms, imports = run_scenario(scenario, args.runs, workdir)
+    heaviest = sorted(imports.items(), key=lambda x: x[1], reverse=True)[:4]
+    listed = ', '.join(f'{name} {us / 1000:.1f}ms' for name, us in heaviest)
+    status = 'OK  ' if wall_ms <= args.budget else 'SLOW'
+    print(f"{scenario[0]:<14} {wall_ms:7.1f}ms  {status} {listed}")
+
+    loaded_heavy = [name for name in HEAVY_MODULES if name in imports]
+    if loaded_heavy:
+        print(f"{'':<14} heavy dependencies imported: {', '.join(loaded_heavy)}")
+    return wall_ms > args.budget
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark site_cli.py startup")
+    parser.add_argument('--budget', type=float, default=100.0, help="max median wall time in ms")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    scratch = tempfile.mkdtemp(prefix='bench-site-')
+    workdir = os.path.join(scratch, 'site')
+    shutil.copytree(os.path.dirname(os.path.abspath(__file__)), workdir, ignore=SKIP_COPY)
+    try:
+        print(f"{'scenario':<14} {'median':>9}  heaviest imports")
+        for scenario in SCENARIOS:
+            failed = report_scenario(scenario, args, workdir) or failed
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if failed:
+        print(f"\n❌ Some scenarios exceeded the {args.budget:.0f} ms budget")
+        sys.exit(1)
+    print(f"\n✅ All scenarios within {args.budget:.0f} ms")
+
+if __name__ == "__main__":
+    main()
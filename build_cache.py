@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the incremental build scripts: content hashing,
+a small JSON manifest of input hashes, an LRU cache of rendered HTML
+fragments, atomic/streaming file writes and replacing marker-delimited
+blocks in the pages
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import shutil
+from contextlib import contextmanager
+
+CACHE_DIR = '.build_cache'
+MANIFEST_FILE = os.path.join(CACHE_DIR, 'manifest.json')
+FRAGMENT_DIR = os.path.join(CACHE_DIR, 'fragments')
+
+def text_digest(*parts):
+    """
+    Return a sha256 hex digest of one or more strings / JSON-serialisable values
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, (str, bytes)):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False)
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        h.update(part)
+        h.update(b'\0')
+    return h.hexdigest()
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Return the sha256 hex digest of a file's bytes, read in chunks
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+@contextmanager
+def open_atomic(path, mode='w', encoding='utf-8'):
+    """
+    Open a temporary file next to `path` for streaming writes and rename it
+    into place when the block exits cleanly
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        if 'b' in mode:
+            f = os.fdopen(fd, mode)
+        else:
+            f = os.fdopen(fd, mode, encoding=encoding, newline='')
+        with f:
+            yield f
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_file_atomic(path, content):
+    """
+    Write content to path through a temporary file and rename,
+    so a failed write never leaves a half-written page behind
+    """
+    with open_atomic(path) as f:
+        f.write(content)
+
+def replace_marked_block(html_file, start_marker, end_marker, block, anchor, label, indent=None):
+    """
+    Replace the text between start_marker and end_marker (inclusive) in html_file
+    with `block`, every line indented like the start marker
+
+    The first time, the block is inserted at anchor(content), the offset of an
+    element it goes before (own line) or right after (rest of the line);
+    `indent` overrides the anchor line's indentation. Returns whether the file
+    changed, or None after printing an error.
+    """
+    with open(html_file, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
+
+    def marked(indent):
+        lines = [indent + line if line.strip() else line for line in block.split('\n')]
+        return f"{start_marker}\n" + '\n'.join(lines) + f"\n{indent}{end_marker}"
+
+    start = content.find(start_marker)
+    if start != -1:
+        end = content.find(end_marker, start + len(start_marker))
+        if end == -1:
+            print(f"Error: Unterminated {label} block in {html_file}")
+            return None
+        line_start = content.rfind('\n', 0, start) + 1
+        new_content = (content[:start] + marked(content[line_start:start])
+                       + content[end + len(end_marker):])
+    else:
+        offset = anchor(content)
+        if offset is None or offset < 0:
+            print(f"Error: Could not find where to insert the {label} in {html_file}")
+            return None
+        line_start = content.rfind('\n', 0, offset) + 1
+        prefix = content[line_start:offset]
+        if prefix.strip():
+            if indent is None:
+                indent = prefix[:len(prefix) - len(prefix.lstrip())]
+            new_content = content[:offset] + f"\n{indent}{marked(indent)}" + content[offset:]
+        else:
+            if indent is None:
+                indent = prefix
+            new_content = content[:line_start] + f"{indent}{marked(indent)}\n" + content[line_start:]
+
+    if new_content == content:
+        return False
+    write_file_atomic(html_file, new_content)
+    return True
+
+def xml_escape(text, quote=False):
+    """
+    Escape text for XML/SVG output (avoids xml.sax.saxutils, which pulls in urllib at import)
+    """
+    text = str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    if quote:
+        text = text.replace('"', '&quot;')
+    return text
+
+class BuildCache:
+    """
+    Records the input hash each build output was last generated from
+    """
+
+    def __init__(self, manifest_file=MANIFEST_FILE):
+        self.manifest_file = manifest_file
+        self.entries = {}
+        if os.path.exists(manifest_file):
+            try:
+                with open(manifest_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable build manifest {manifest_file}")
+                self.entries = {}
+
+    def is_fresh(self, key, digest, outputs=()):
+        """
+        True if `key` was last built from `digest` and all its outputs still exist
+        """
+        if self.entries.get(key) != digest:
+            return False
+        return all(os.path.exists(path) for path in outputs)
+
+    def record(self, key, digest):
+        self.entries[key] = digest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.manifest_file) or '.', exist_ok=True)
+        write_file_atomic(self.manifest_file, json.dumps(self.entries, indent=2, sort_keys=True) + '\n')
+
+class FragmentCache:
+    """
+    On-disk cache of rendered HTML fragments keyed by a hash of their input,
+    evicting the least recently used fragments beyond `max_entries`
+
+    Newly rendered fragments are held in memory and only written by save(),
+    so a long-running preview can share the cache without touching the disk.
+    """
+
+    def __init__(self, directory=FRAGMENT_DIR, max_entries=64):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.index_file = os.path.join(directory, 'index.json')
+        self.hits = 0
+        self.misses = 0
+        # digest -> last-use tick; a higher tick is more recently used
+        self.index = {}
+        # digest -> fragment rendered since the last save()
+        self.pending = {}
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable fragment index {self.index_file}")
+                self.index = {}
+        self.tick = max(self.index.values(), default=0)
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest + '.html')
+
+    def get_or_render(self, namespace, data, render):
+        """
+        Return the cached fragment for (namespace, data), calling render() on a miss
+        """
+        digest = text_digest('fragment', namespace, data)
+        self.tick += 1
+        if digest in self.pending:
+            self.index[digest] = self.tick
+            self.hits += 1
+            return self.pending[digest]
+        if digest in self.index and os.path.exists(self.path(digest)):
+            with open(self.path(digest), 'r', encoding='utf-8', newline='') as f:
+                fragment = f.read()
+            self.index[digest] = self.tick
+            self.hits += 1
+            return fragment
+
+        fragment = render()
+        self.pending[digest] = fragment
+        self.index[digest] = self.tick
+        self.misses += 1
+        if len(self.pending) > self.max_entries:
+            # Unsaved fragments would be evicted by save() anyway; keep memory bounded
+            oldest = min(self.pending, key=self.index.get)
+            del self.pending[oldest]
+            del self.index[oldest]
+        return fragment
+
+    def save(self):
+        """
+        Write the fragments rendered since the last save, evict the least
+        recently used ones and write the index
+        """
+        ordered = sorted(self.index, key=self.index.get, reverse=True)
+        for digest in ordered[self.max_entries:]:
+            self.pending.pop(digest, None)
+            if os.path.exists(self.path(digest)):
+                os.remove(self.path(digest))
+            del self.index[digest]
+        os.makedirs(self.directory, exist_ok=True)
+        for digest, fragment in self.pending.items():
+            write_file_atomic(self.path(digest), fragment)
+        self.pending = {}
+        write_file_atomic(self.index_file, json.dumps(self.index, indent=2, sort_keys=True) + '\n')
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Script to build self-hosted, subsetted WOFF2 web fonts for cv.html and index.html
+
+Each face is cut down to the characters that actually appear in the site text
+(plus printable ASCII, so routine edits never need a rebuild) and written to
+fonts/subset/ with the glyph-set hash in its file name. A subset is only
+regenerated when its source font changes or the text gains new characters.
+
+The source TTF files go in fonts/src/ (static instances from Google Fonts):
+
+    Merriweather-Bold.ttf, OpenSans-Light.ttf, OpenSans-Regular.ttf,
+    OpenSans-Italic.ttf, OpenSans-Bold.ttf
+"""
+
+import os
+import re
+import sys
+import json
+import html
+import string
+from io import BytesIO
+
+from build_cache import file_digest, text_digest, open_atomic, write_file_atomic, replace_marked_block
+
+FONT_DIR = 'fonts'
+SOURCE_DIR = os.path.join(FONT_DIR, 'src')
+SUBSET_DIR = os.path.join(FONT_DIR, 'subset')
+MANIFEST_FILE = os.path.join(SUBSET_DIR, 'manifest.json')
+PAGES = ['index.html', 'cv.html']
+
+# Bump when the subsetting options change so every subset is rebuilt
+SUBSET_VERSION = 1
+BASE_CHARACTERS = string.printable.strip() + ' \u00a0–—‘’“”•'
+
+# Only the faces the pages really use; `preload` marks the ones needed for the first paint
+FACES = [
+    {'family': 'Merriweather', 'weight': 700, 'style': 'normal', 'source': 'Merriweather-Bold.ttf',
+     'pages': ['cv.html'], 'preload': True},
+    {'family': 'Open Sans', 'weight': 300, 'style': 'normal', 'source': 'OpenSans-Light.ttf',
+     'pages': ['cv.html'], 'preload': False},
+    {'family': 'Open Sans', 'weight': 400, 'style': 'normal', 'source': 'OpenSans-Regular.ttf',
+     'pages': ['cv.html', 'index.html'], 'preload': True},
+    {'family': 'Open Sans', 'weight': 400, 'style': 'italic', 'source': 'OpenSans-Italic.ttf',
+     'pages': ['cv.html'], 'preload': False},
+    {'family': 'Open Sans', 'weight': 700, 'style': 'normal', 'source': 'OpenSans-Bold.ttf',
+     'pages': ['cv.html', 'index.html'], 'preload': True},
+]
+
+FONTS_START = '<!-- fonts:start -->'
+FONTS_END = '<!-- fonts:end -->'
+
+def face_id(face):
+    return f"{re.sub(r'[^a-z0-9]+', '-', face['family'].lower())}-{face['weight']}-{face['style']}"
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def page_text(content):
+    """
+    Visible text of a page: markup, scripts and styles removed, entities decoded
+    """
+    content = re.sub(r'<(script|style)\b.*?</\1>', ' ', content, flags=re.IGNORECASE | re.DOTALL)
+    content = re.sub(r'<!--.*?-->', ' ', content, flags=re.DOTALL)
+    return html.unescape(re.sub(r'<[^>]+>', ' ', content))
+
+def collect_glyphs(pages=PAGES):
+    """
+    Return the sorted string of characters used across the pages
+    """
+    characters = set(BASE_CHARACTERS)
+    for page in pages:
+        if os.path.exists(page):
+            with open(page, 'r', encoding='utf-8') as f:
+                characters.update(page_text(f.read()))
+    return ''.join(sorted(c for c in characters if c.isprintable() or c == '\u00a0'))
+
+def subset_font(source, glyphs):
+    """
+    Subset one font to the given characters and return the WOFF2 bytes
+    """
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['kern', 'liga', 'calt', 'ccmp', 'locl', 'mark', 'mkmk']
+    options.desubroutinize = True
+    options.hinting = False
+
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(c) for c in glyphs])
+    subsetter.subset(font)
+
+    buffer = BytesIO()
+    subset.save_font(font, buffer, options)
+    font.close()
+    return buffer.getvalue()
+
+def build_subsets(glyphs, faces=FACES, source_dir=SOURCE_DIR, manifest_file=MANIFEST_FILE, force=False):
+    """
+    Make sure every face with a source file has an up-to-date subset; faces are
+    keyed by (source hash, glyph set) so unchanged text never re-subsets
+    """
+    manifest = load_manifest(manifest_file)
+    subset_dir = os.path.dirname(manifest_file)
+    changed = False
+
+    for face in faces:
+        key = face_id(face)
+        source = os.path.join(source_dir, face['source'])
+        if not os.path.exists(source):
+            print(f"  Warning: {source} not found, skipping {face['family']} {face['weight']} {face['style']}")
+            continue
+
+        digest = text_digest('font-subset', SUBSET_VERSION, file_digest(source), glyphs)
+        entry = manifest.get(key)
+        if not force and entry and entry['hash'] == digest and os.path.exists(entry['path']):
+            continue
+
+        try:
+            data = subset_font(source, glyphs)
+        except ImportError:
+            print("Error: fonttools and brotli are required to build web fonts (pip install fonttools brotli)")
+            return None
+
+        os.makedirs(subset_dir, exist_ok=True)
+        path = os.path.join(subset_dir, f'{key}-{digest[:10]}.woff2').replace(os.sep, '/')
+        with open_atomic(path, 'wb') as f:
+            f.write(data)
+
+        # Remove the subset built for the previous glyph set
+        if entry and entry['path'] != path and os.path.exists(entry['path']):
+            os.remove(entry['path'])
+
+        manifest[key] = {'hash': digest, 'path': path, 'glyphs': len(glyphs)}
+        changed = True
+        print(f"  Subset {face['source']} to {len(glyphs)} characters: "
+              f"{os.path.getsize(source) // 1024} KB -> {len(data) // 1024} KB")
+
+    if changed:
+        write_file_atomic(manifest_file, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return manifest
+
+def page_faces(page, manifest, faces=FACES):
+    """
+    (face, manifest entry) pairs for the built faces a page uses
+    """
+    return [(face, manifest[face_id(face)]) for face in faces
+            if page in face['pages'] and face_id(face) in manifest]
+
+def font_head(page, manifest=None, indent='    ', base_dir='.'):
+    """
+    Preload links and @font-face rules for a page, or '' if none of its faces are built
+    (font URLs are relative to `base_dir`, the directory the page is written to)
+    """
+    if manifest is None:
+        manifest = load_manifest()
+    used = [(face, dict(entry, path=os.path.relpath(entry['path'], base_dir).replace(os.sep, '/')))
+            for face, entry in page_faces(page, manifest)]
+    if not used:
+        return ''
+
+    lines = [f'<link rel="preload" href="{entry["path"]}" as="font" type="font/woff2" crossorigin>'
+             for face, entry in used if face['preload']]
+    lines.append('<style>')
+    for face, entry in used:
+        lines.extend([
+            '    @font-face {',
+            f"        font-family: '{face['family']}';",
+            f"        font-style: {face['style']};",
+            f"        font-weight: {face['weight']};",
+            '        font-display: swap;',
+            f"        src: url('{entry['path']}') format('woff2');",
+            '    }'
+        ])
+    lines.append('</style>')
+    return f'\n{indent}'.join(lines)
+
+def update_page_fonts(html_file, manifest):
+    """
+    Replace (or insert before the first stylesheet) the self-hosted fonts block in a page
+    """
+    head = font_head(os.path.basename(html_file), manifest, indent='', base_dir=os.path.dirname(html_file) or '.')
+    if not head:
+        return True
+
+    def before_stylesheets(content):
+        # Preloads should be discovered before the stylesheets that use the fonts
+        insert_at = content.find('<link rel="stylesheet"')
+        return insert_at if insert_at != -1 else content.find('</head>')
+
+    changed = replace_marked_block(html_file, FONTS_START, FONTS_END, head, before_stylesheets, 'fonts')
+    if changed:
+        print(f"  Updated fonts block in {html_file}")
+    return changed is not None
+
+def main(force=False):
+    if not os.path.exists('index.html'):
+        print("Error: index.html not found!")
+        return
+
+    glyphs = collect_glyphs()
+    print(f"Building web font subsets for {len(glyphs)} characters...")
+    manifest = build_subsets(glyphs, force=force)
+    if manifest is None:
+        return
+    if not manifest:
+        print(f"No source fonts in {SOURCE_DIR}/, the pages keep using fallback fonts")
+        return
+
+    if update_page_fonts('index.html', manifest):
+        total = sum(os.path.getsize(entry['path']) for _, entry in page_faces('cv.html', manifest))
+        print(f"✅ Web fonts ready ({total // 1024} KB for cv.html); run generate_cv.py to pick them up")
+
+if __name__ == "__main__":
+    main(force='--force' in sys.argv[1:])
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Script to build responsive thumbnails and blurred placeholders (LQIP) for the
+presentations carousel and switch its markup to lazy loading
+"""
+
+import os
+import re
+import sys
+import json
+import base64
+from io import BytesIO
+
+from build_cache import file_digest, write_file_atomic
+
+THUMB_DIR = os.path.join('Images', 'presentation', 'thumbs')
+MANIFEST_FILE = os.path.join(THUMB_DIR, 'manifest.json')
+WIDTHS = [640, 1280]
+DISPLAY_HEIGHT = 480
+LQIP_WIDTH = 24
+
+CAROUSEL_START = '<div class="carousel-inner" role="listbox">'
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def make_variants(src, digest, thumb_dir=THUMB_DIR):
+    """
+    Write the fixed-width JPEG variants of one image and return its manifest entry
+    """
+    from PIL import Image, ImageFilter, ImageOps
+
+    stem = re.sub(r'[^A-Za-z0-9_-]+', '_', os.path.splitext(os.path.basename(src))[0])
+    os.makedirs(thumb_dir, exist_ok=True)
+
+    with Image.open(src) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+
+    variants = []
+    for width in WIDTHS:
+        # Never upscale; keep the aspect ratio inside a width x (height at 2x density) box
+        copy = image.copy()
+        copy.thumbnail((width, DISPLAY_HEIGHT * width // WIDTHS[0]), Image.LANCZOS)
+        path = os.path.join(thumb_dir, f'{stem}-{digest[:10]}-{width}.jpg')
+        copy.save(path, 'JPEG', quality=75, optimize=True, progressive=True)
+        variants.append({'path': path.replace(os.sep, '/'), 'width': copy.width, 'height': copy.height})
+
+    tiny = image.copy()
+    tiny.thumbnail((LQIP_WIDTH, LQIP_WIDTH), Image.BILINEAR)
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    tiny.save(buffer, 'JPEG', quality=40, optimize=True)
+    lqip = 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+    return {'hash': digest, 'variants': variants, 'lqip': lqip}
+
+def build_thumbnails(sources, manifest_file=MANIFEST_FILE, force=False):
+    """
+    Make sure every source image has up-to-date variants; images are keyed by
+    content hash so unchanged photos are never re-encoded
+    """
+    manifest = load_manifest(manifest_file)
+    changed = False
+
+    for src in sources:
+        if not os.path.exists(src):
+            print(f"  Warning: {src} not found, leaving it as is")
+            continue
+        digest = file_digest(src)
+        entry = manifest.get(src)
+        if (not force and entry and entry['hash'] == digest
+                and all(os.path.exists(v['path']) for v in entry['variants'])):
+            continue
+
+        try:
+            new_entry = make_variants(src, digest, os.path.dirname(manifest_file))
+        except ImportError:
+            print("Error: Pillow is required to build thumbnails (pip install Pillow)")
+            return None
+
+        # Remove variants of the previous version of this image
+        if entry:
+            for variant in entry['variants']:
+                if variant['path'] not in [v['path'] for v in new_entry['variants']] and os.path.exists(variant['path']):
+                    os.remove(variant['path'])
+
+        manifest[src] = new_entry
+        changed = True
+        saved = os.path.getsize(src) - os.path.getsize(new_entry['variants'][0]['path'])
+        print(f"  Built thumbnails for {src} ({saved // 1024} KB smaller at {WIDTHS[0]}px)")
+
+    if changed:
+        write_file_atomic(manifest_file, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return manifest
+
+def find_carousel_images(content):
+    """
+    Return (start, end, [img match]) for the <img> tags inside the carousel;
+    a match includes the <noscript> fallback that follows a lazy <img>
+    """
+    start = content.find(CAROUSEL_START)
+    if start == -1:
+        return None
+    # The slides block ends at the carousel controls
+    end = content.find('carousel-control', start)
+    if end == -1:
+        return None
+    return start, end, list(re.finditer(r'<img\b([^>]*)>(?:\s*<noscript>.*?</noscript>)?', content[start:end], re.DOTALL))
+
+def image_attrs(attr_text):
+    return dict(re.findall(r'([\w-]+)="([^"]*)"', attr_text))
+
+def lazy_img_tag(attrs, entry):
+    """
+    Build the lazy <img>: blurred placeholder as src, real variants in data-srcset,
+    followed by a <noscript> copy with the real image for browsers without JavaScript
+    """
+    variants = entry['variants']
+    srcset = ', '.join(f"{v['path']} {v['width']}w" for v in variants)
+    largest = variants[-1]
+    classes = ' '.join(c for c in attrs.get('class', '').split() if c not in ('lazy-slide', 'loaded'))
+    sizes = 'sizes="(max-width: 700px) 100vw, 640px"'
+    box = f'width="{largest["width"]}" height="{largest["height"]}" alt="{attrs.get("alt", "")}"'
+    fallback_class = f' class="{classes}"' if classes else ''
+    return (f'<img src="{entry["lqip"]}" data-src="{variants[0]["path"]}" data-srcset="{srcset}" '
+            f'{sizes} data-full="{attrs["data-full"]}" {box} class="{(classes + " lazy-slide").strip()}">'
+            f'<noscript><img src="{variants[0]["path"]}" srcset="{srcset}" {sizes} {box} '
+            f'loading="lazy"{fallback_class}></noscript>')
+
+def update_carousel_markup(html_file, manifest):
+    """
+    Rewrite the carousel <img> tags to the lazy-loading form
+    """
+    with open(html_file, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
+
+    located = find_carousel_images(content)
+    if located is None:
+        print("Error: Could not find the presentations carousel in HTML file")
+        return False
+    start, _, matches = located
+
+    pieces = []
+    cursor = 0
+    for match in matches:
+        attrs = image_attrs(match.group(1))
+        attrs.setdefault('data-full', attrs.get('src', ''))
+        entry = manifest.get(attrs['data-full'])
+        if not entry:
+            continue
+        pieces.append(content[cursor:start + match.start()])
+        pieces.append(lazy_img_tag(attrs, entry))
+        cursor = start + match.end()
+    pieces.append(content[cursor:])
+
+    new_content = ''.join(pieces)
+    if new_content != content:
+        write_file_atomic(html_file, new_content)
+        print(f"  Updated carousel markup in {html_file}")
+    return True
+
+def main(force=False):
+    html_file = 'index.html'
+    if not os.path.exists(html_file):
+        print(f"Error: {html_file} not found!")
+        return
+
+    with open(html_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    located = find_carousel_images(content)
+    if located is None:
+        print("Error: Could not find the presentations carousel in HTML file")
+        return
+
+    sources = []
+    for match in located[2]:
+        attrs = image_attrs(match.group(1))
+        sources.append(attrs.get('data-full') or attrs.get('src'))
+
+    print(f"Building thumbnails for {len(sources)} carousel images...")
+    manifest = build_thumbnails(sources, force=force)
+    if manifest is None:
+        return
+
+    if update_carousel_markup(html_file, manifest):
+        # Before: every full image; after: the placeholders plus the first visible slide
+        built = [src for src in sources if src in manifest]
+        original = sum(os.path.getsize(src) for src in built)
+        initial = sum(len(manifest[src]['lqip']) for src in built)
+        if built:
+            initial += os.path.getsize(manifest[built[0]]['variants'][0]['path'])
+        print(f"✅ Initial carousel payload: {initial // 1024} KB (was {original // 1024} KB)")
+
+if __name__ == "__main__":
+    main(force='--force' in sys.argv[1:])
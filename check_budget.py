@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Performance budget check for the generated pages
+
+Statically walks index.html and cv.html (or their dist/ build) and the
+stylesheets they load, then totals the initial transfer size, request count,
+render-blocking resources and the largest above-the-fold image. Exits
+non-zero when a page is over the budgets in budget.json.
+
+    python check_budget.py              # check the pages in the repo root
+    python check_budget.py --dir dist   # check the content-addressed build
+"""
+
+import os
+import re
+import sys
+import json
+import zlib
+import argparse
+
+from asset_store import resolve_reference, CSS_URL
+
+BUDGET_FILE = 'budget.json'
+PAGES = ['index.html', 'cv.html']
+
+# Text types are served compressed by the host; estimate that with zlib level 6
+COMPRESSED_EXTENSIONS = {'.html', '.css', '.js', '.svg', '.json', '.xml', '.txt'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico'}
+
+TAG = re.compile(r'<(link|script|img|iframe|source|style)\b([^>]*)>', re.IGNORECASE)
+ATTR = re.compile(r'([\w-]+)(?:="([^"]*)")?')
+CSS_IMPORT = re.compile(r'@import\s+(?:url\()?\s*[\'"]?([^\'")\s;]+)', re.IGNORECASE)
+CSS_RULE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+
+def transfer_size(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if os.path.splitext(path)[1].lower() in COMPRESSED_EXTENSIONS:
+        return len(zlib.compress(data, 6))
+    return len(data)
+
+def parse_attrs(text):
+    return {name.lower(): value if value is not None else '' for name, value in ATTR.findall(text)}
+
+class PageAnalysis:
+    """
+    Collects every resource the page fetches on initial load
+    """
+
+    def __init__(self, page, root):
+        self.page = page
+        self.root = root
+        self.resources = {}
+        self.missing = set()
+        self.above_fold_images = set()
+
+    def add(self, ref, base_dir, kind, blocking=False, above_fold=False):
+        """
+        Record a resource; returns its local path (None for external or missing)
+        """
+        if not ref or ref.startswith('data:') or ref.startswith('#'):
+            return None
+        resolved = resolve_reference(ref, base_dir, self.root)
+        if resolved is None:
+            key, path = ref, None
+        else:
+            path = resolved[0]
+            if not os.path.isfile(path):
+                self.missing.add(path)
+                return None
+            key = path
+
+        entry = self.resources.setdefault(key, {
+            'kind': kind,
+            'bytes': transfer_size(path) if path else None,
+            'blocking': False
+        })
+        entry['blocking'] = entry['blocking'] or blocking
+        if above_fold and kind == 'image':
+            self.above_fold_images.add(key)
+        return path
+
+    def walk_css(self, css, base_dir, blocking, fold_html):
+        """
+        Follow @import and url() references of a stylesheet; background images whose
+        selector targets an element above the fold count as above-the-fold images
+        """
+        for ref in CSS_IMPORT.findall(css):
+            path = self.add(ref, base_dir, 'css', blocking=blocking)
+            if path:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    self.walk_css(f.read(), os.path.dirname(path), blocking, fold_html)
+
+        for selector, body in CSS_RULE.findall(css):
+            for match in CSS_URL.finditer(body):
+                ref = match.group(2)
+                ext = os.path.splitext(ref.split('?')[0].split('#')[0])[1].lower()
+                kind = 'image' if ext in IMAGE_EXTENSIONS else 'font'
+                # Fonts and images are only fetched when used; count fonts from @font-face
+                # and images from rules that match something above the fold
+                if kind == 'font' and '@font-face' not in selector:
+                    continue
+                above = kind == 'image' and selector_above_fold(selector, fold_html)
+                if kind == 'image' and not above:
+                    continue
+                self.add(ref, base_dir, kind, above_fold=above)
+
+def selector_above_fold(selector, fold_html):
+    """
+    Rough match of a CSS selector against the above-the-fold markup
+    """
+    for part in selector.split(','):
+        compound = part.strip().split()[-1] if part.strip() else ''
+        for token in re.findall(r'([#.]?)([\w-]+)', compound):
+            prefix, name = token
+            if prefix == '#' and f'id="{name}"' in fold_html:
+                return True
+            if prefix == '.' and re.search(rf'class="[^"]*\b{re.escape(name)}\b', fold_html):
+                return True
+            if not prefix and re.search(rf'<{re.escape(name)}\b', fold_html):
+                return True
+    return False
+
+def analyze_page(page_path, root, fold_sections=1):
+    """
+    Return the PageAnalysis for one page
+    """
+    with open(page_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    base_dir = os.path.dirname(page_path)
+    analysis = PageAnalysis(page_path, root)
+    analysis.add(os.path.basename(page_path), base_dir, 'html')
+
+    head_end = html.find('</head>')
+    body_start = html.find('<body')
+    # Above the fold: everything in <body> up to the end of the first N sections
+    fold_end = body_start
+    for _ in range(fold_sections):
+        next_end = html.find('</section>', fold_end + 1)
+        if next_end == -1:
+            fold_end = len(html)
+            break
+        fold_end = next_end
+    fold_html = html[body_start:fold_end] if body_start != -1 else html
+
+    for match in TAG.finditer(html):
+        tag = match.group(1).lower()
+        attrs = parse_attrs(match.group(2))
+        in_head = head_end != -1 and match.start() < head_end
+        above = body_start != -1 and body_start <= match.start() < fold_end
+
+        if tag == 'link':
+            rel = attrs.get('rel', '').lower().split()
+            if 'stylesheet' in rel:
+                blocking = in_head and attrs.get('media', 'all') not in ('print',) and 'disabled' not in attrs
+                path = analysis.add(attrs.get('href'), base_dir, 'css', blocking=blocking)
+                if path:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        analysis.walk_css(f.read(), os.path.dirname(path), blocking, fold_html)
+            elif 'preload' in rel or 'icon' in rel:
+                analysis.add(attrs.get('href'), base_dir, attrs.get('as') or 'other')
+        elif tag == 'script' and 'src' in attrs:
+            blocking = in_head and 'async' not in attrs and 'defer' not in attrs and attrs.get('type') != 'module'
+            analysis.add(attrs['src'], base_dir, 'js', blocking=blocking)
+        elif tag in ('img', 'source'):
+            if attrs.get('loading') == 'lazy':
+                continue
+            analysis.add(attrs.get('src'), base_dir, 'image', above_fold=above)
+        elif tag == 'iframe':
+            if attrs.get('loading') != 'lazy':
+                analysis.add(attrs.get('src'), base_dir, 'iframe')
+        elif tag == 'style':
+            end = html.find('</style>', match.end())
+            analysis.walk_css(html[match.end():end], base_dir, in_head, fold_html)
+
+    return analysis
+
+def summarize(analysis):
+    resources = analysis.resources
+    known = [entry['bytes'] for entry in resources.values() if entry['bytes'] is not None]
+    above = [(key, resources[key]['bytes'] or 0) for key in analysis.above_fold_images]
+    largest = max(above, key=lambda x: x[1]) if above else (None, 0)
+    return {
+        'transfer_kb': sum(known) / 1024,
+        'requests': len(resources),
+        'render_blocking': sum(1 for entry in resources.values() if entry['blocking']),
+        'largest_above_fold_image_kb': largest[1] / 1024,
+        'largest_above_fold_image': largest[0],
+        'external': sum(1 for entry in resources.values() if entry['bytes'] is None)
+    }
+
+def print_breakdown(analysis):
+    rows = sorted(analysis.resources.items(), key=lambda x: x[1]['bytes'] or 0, reverse=True)
+    for key, entry in rows:
+        size = f"{entry['bytes'] / 1024:8.1f} KB" if entry['bytes'] is not None else '    external'
+        flags = ' blocking' if entry['blocking'] else ''
+        flags += ' above-fold' if key in analysis.above_fold_images else ''
+        print(f"    {size}  {entry['kind']:<6} {key}{flags}")
+    for path in sorted(analysis.missing):
+        print(f"     missing  {'':<6} {path}")
+
+def main(directory='.', budget_file=BUDGET_FILE, quiet=False):
+    with open(budget_file, 'r', encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    failed = False
+    for page in PAGES:
+        page_path = os.path.join(directory, page)
+        if not os.path.exists(page_path):
+            print(f"Skipping {page_path} (not found)")
+            continue
+
+        budget = budgets.get(page, {})
+        analysis = analyze_page(page_path, directory, budget.get('fold_sections', 1))
+        summary = summarize(analysis)
+
+        over = []
+        print(f"\n{page_path}")
+        for metric in ('transfer_kb', 'requests', 'render_blocking', 'largest_above_fold_image_kb'):
+            value = summary[metric]
+            limit = budget.get(metric)
+            status = '  ' if limit is None or value <= limit else '❌'
+            if status == '❌':
+                over.append(metric)
+            limit_text = f"{limit}" if limit is not None else '-'
+            print(f"  {status} {metric:<28} {value:10.1f}  (budget {limit_text})")
+        if summary['largest_above_fold_image']:
+            print(f"     largest above-the-fold image: {summary['largest_above_fold_image']}")
+        if summary['external']:
+            print(f"     {summary['external']} third-party requests not included in transfer size")
+
+        if over or not quiet:
+            print("  Resources:")
+            print_breakdown(analysis)
+        failed = failed or bool(over)
+
+    if failed:
+        print("\n❌ Performance budget exceeded")
+        sys.exit(1)
+    print("\n✅ All pages within budget")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check page weight budgets")
+    parser.add_argument('--dir', default='.', help="directory holding the built pages (e.g. dist)")
+    parser.add_argument('--budget', default=BUDGET_FILE, help="budget file")
+    parser.add_argument('--quiet', action='store_true', help="only show the breakdown for failing pages")
+    args = parser.parse_args()
+    main(args.dir, args.budget, args.quiet)
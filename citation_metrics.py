@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Append-only store of Google Scholar citation snapshots, and a build step that
+renders a static "citations over time" SVG chart into index.html
+"""
+
+import os
+import sys
+import sqlite3
+from datetime import date
+
+from build_cache import BuildCache, text_digest, file_digest, replace_marked_block, xml_escape as escape
+
+DB_FILE = os.path.join('data', 'citations.sqlite')
+
+CHART_START = '<!-- citations-chart:start -->'
+CHART_END = '<!-- citations-chart:end -->'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    scholar_id TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    citedby INTEGER,
+    hindex INTEGER,
+    i10index INTEGER
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_author ON snapshots (scholar_id, taken_at);
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    pub_key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS citation_counts (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    publication_id INTEGER NOT NULL REFERENCES publications (id),
+    citations INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, publication_id)
+) WITHOUT ROWID;
+"""
+
+def open_store(db_file=DB_FILE):
+    """
+    Open (and create if needed) the citation time-series database
+    """
+    directory = os.path.dirname(db_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.executescript(SCHEMA)
+    return conn
+
+def publication_key(pub):
+    """
+    Stable key for a scholarly publication: its Scholar id, or a hash of the title
+    """
+    key = pub.get('author_pub_id')
+    if key:
+        return key
+    title = pub.get('bib', {}).get('title', '')
+    return 'title:' + text_digest(title.strip().lower())[:24]
+
+def record_snapshot(conn, scholar_id, author, publications, taken_at=None):
+    """
+    Append one snapshot: author-level indices plus each publication's citation count
+    Returns the new snapshot id
+    """
+    taken_at = taken_at or date.today().isoformat()
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO snapshots (scholar_id, taken_at, citedby, hindex, i10index) VALUES (?, ?, ?, ?, ?)",
+            (scholar_id, taken_at, author.get('citedby'), author.get('hindex'), author.get('i10index'))
+        )
+        snapshot_id = cursor.lastrowid
+
+        rows = []
+        for pub in publications:
+            title = pub.get('bib', {}).get('title')
+            if not title:
+                continue
+            key = publication_key(pub)
+            conn.execute("INSERT OR IGNORE INTO publications (pub_key, title) VALUES (?, ?)", (key, title))
+            publication_id = conn.execute("SELECT id FROM publications WHERE pub_key = ?", (key,)).fetchone()[0]
+            rows.append((snapshot_id, publication_id, int(pub.get('num_citations') or 0)))
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO citation_counts (snapshot_id, publication_id, citations) VALUES (?, ?, ?)",
+            rows
+        )
+    return snapshot_id
+
+def load_author_series(conn, scholar_id):
+    """
+    Load author-level indices for every snapshot as NumPy arrays, oldest first
+    """
+    import numpy as np
+
+    rows = conn.execute(
+        "SELECT id, taken_at, COALESCE(citedby, -1), COALESCE(hindex, -1), COALESCE(i10index, -1) "
+        "FROM snapshots WHERE scholar_id = ? ORDER BY taken_at, id",
+        (scholar_id,)
+    ).fetchall()
+
+    columns = list(zip(*rows)) if rows else [(), (), (), (), ()]
+    return {
+        'snapshot_id': np.array(columns[0], dtype=np.int64),
+        'taken_at': np.array(columns[1], dtype='datetime64[D]'),
+        'citedby': np.array(columns[2], dtype=np.int64),
+        'hindex': np.array(columns[3], dtype=np.int64),
+        'i10index': np.array(columns[4], dtype=np.int64)
+    }
+
+def load_citation_matrix(conn, snapshot_ids):
+    """
+    Pivot per-publication counts into a (snapshot x publication) matrix
+    Returns (publication titles, matrix); missing counts are 0
+    """
+    import numpy as np
+
+    snapshot_ids = np.asarray(snapshot_ids, dtype=np.int64)
+    titles = conn.execute("SELECT id, title FROM publications ORDER BY id").fetchall()
+    if not len(snapshot_ids) or not titles:
+        return [title for _, title in titles], np.zeros((len(snapshot_ids), len(titles)), dtype=np.int64)
+
+    counts = np.array(
+        conn.execute(
+            "SELECT snapshot_id, publication_id, citations FROM citation_counts "
+            "WHERE snapshot_id BETWEEN ? AND ?",
+            (int(snapshot_ids.min()), int(snapshot_ids.max()))
+        ).fetchall(),
+        dtype=np.int64
+    ).reshape(-1, 3)
+
+    publication_ids = np.array([pub_id for pub_id, _ in titles], dtype=np.int64)
+    order = np.argsort(snapshot_ids)
+    row = np.searchsorted(snapshot_ids, counts[:, 0], sorter=order)
+    row = np.clip(row, 0, len(snapshot_ids) - 1)
+    keep = snapshot_ids[order[row]] == counts[:, 0]
+    col = np.searchsorted(publication_ids, counts[:, 1])
+
+    matrix = np.zeros((len(snapshot_ids), len(publication_ids)), dtype=np.int64)
+    matrix[order[row[keep]], col[keep]] = counts[keep, 2]
+    return [title for _, title in titles], matrix
+
+def citation_totals(series, matrix):
+    """
+    Total citations per snapshot: the author-level count where Scholar reported one,
+    otherwise the sum over publications
+    """
+    import numpy as np
+
+    summed = matrix.sum(axis=1)
+    return np.where(series['citedby'] >= 0, series['citedby'], summed)
+
+def render_chart_svg(series, totals, width=640, height=220, padding=36):
+    """
+    Render total citations and h-index over time as a self-contained inline SVG
+    """
+    import numpy as np
+
+    days = series['taken_at'].astype(np.int64)
+    span = max(int(days.max() - days.min()), 1) if len(days) else 1
+    x = padding + (days - (days.min() if len(days) else 0)) * (width - 2 * padding) / span
+    if len(days) == 1:
+        x = np.array([width / 2.0])
+
+    plot_height = height - 2 * padding
+    max_total = max(int(totals.max()) if len(totals) else 0, 1)
+    y_total = height - padding - totals * plot_height / max_total
+    # Snapshots without an h-index (stored as -1) are left out of its line, not drawn as 0
+    known = series['hindex'] >= 0
+    hindex = series['hindex'][known]
+    max_h = max(int(hindex.max()) if len(hindex) else 0, 1)
+    y_h = height - padding - hindex * plot_height / max_h
+
+    def points(xs, ys):
+        return ' '.join(f'{a:.1f},{b:.1f}' for a, b in zip(xs, ys))
+
+    first = str(series['taken_at'][0]) if len(days) else ''
+    last = str(series['taken_at'][-1]) if len(days) else ''
+    latest_total = int(totals[-1]) if len(totals) else 0
+    latest_h = str(int(hindex[-1])) if len(hindex) else 'n/a'
+
+    circles = ''.join(
+        f'<circle cx="{a:.1f}" cy="{b:.1f}" r="3" fill="#2980b9"><title>{escape(str(d))}: {int(t)} citations</title></circle>'
+        for a, b, d, t in zip(x, y_total, series['taken_at'], totals)
+    )
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="100%" '
+        f'role="img" aria-label="Citations over time: {latest_total} citations, h-index {latest_h}">'
+        f'<line x1="{padding}" y1="{height - padding}" x2="{width - padding}" y2="{height - padding}" stroke="#ccc"/>'
+        f'<polyline fill="none" stroke="#95a5a6" stroke-dasharray="4 3" stroke-width="1.5" points="{points(x[known], y_h)}"/>'
+        f'<polyline fill="none" stroke="#2980b9" stroke-width="2" points="{points(x, y_total)}"/>'
+        f'{circles}'
+        f'<text x="{padding}" y="{height - padding + 18}" font-size="12" fill="#777">{escape(first)}</text>'
+        f'<text x="{width - padding}" y="{height - padding + 18}" font-size="12" fill="#777" text-anchor="end">{escape(last)}</text>'
+        f'<text x="{padding}" y="{padding - 12}" font-size="13" fill="#2980b9">Citations: {latest_total}</text>'
+        f'<text x="{width - padding}" y="{padding - 12}" font-size="13" fill="#7f8c8d" text-anchor="end">h-index: {latest_h}</text>'
+        f'</svg>'
+    )
+
+def update_chart_in_html(html_file, svg):
+    """
+    Replace the chart between the citations-chart markers, adding the markers
+    right after the publications list the first time
+    """
+    def after_publications(content):
+        ul_start = content.find('<ul id="publications-list">')
+        ul_end = content.find('</ul>', ul_start) if ul_start != -1 else -1
+        return ul_end + len('</ul>') if ul_end != -1 else None
+
+    return replace_marked_block(html_file, CHART_START, CHART_END, f'<div id="citations-chart">{svg}</div>',
+                                after_publications, 'citations chart') is not None
+
+def build_chart(scholar_id, html_file='index.html', db_file=DB_FILE, force=False):
+    """
+    Re-render the citations chart when the snapshot store has changed
+    """
+    if not os.path.exists(db_file):
+        print(f"No citation snapshots yet ({db_file} not found), skipping chart")
+        return True
+
+    cache = BuildCache()
+    digest = text_digest('citations-chart', scholar_id, file_digest(db_file), file_digest(__file__))
+    with open(html_file, 'r', encoding='utf-8') as f:
+        has_chart = CHART_START in f.read()
+    if not force and has_chart and cache.is_fresh('citations-chart', digest):
+        print("  Citations chart up to date")
+        return True
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("Error: numpy is required to render the citations chart (pip install numpy)")
+        return False
+
+    conn = open_store(db_file)
+    try:
+        series = load_author_series(conn, scholar_id)
+        if not len(series['snapshot_id']):
+            print(f"No snapshots recorded for {scholar_id}, skipping chart")
+            return True
+        _, matrix = load_citation_matrix(conn, series['snapshot_id'])
+    finally:
+        conn.close()
+
+    svg = render_chart_svg(series, citation_totals(series, matrix))
+    if not update_chart_in_html(html_file, svg):
+        return False
+
+    cache.record('citations-chart', digest)
+    cache.save()
+    print(f"  Rendered citations chart from {len(series['snapshot_id'])} snapshots into {html_file}")
+    return True
+
+def main(scholar_id="xVDuszoAAAAJ", force=False):
+    print(f"Rendering citations chart for Scholar ID: {scholar_id}")
+    build_chart(scholar_id, force=force)
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    main(*args[:1], force='--force' in sys.argv[1:])
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Script to fill in missing DOIs, journals, volumes, issues and pages for publications
+from a Crossref-compatible metadata API, with a persistent lookup cache
+"""
+
+import os
+import re
+import sys
+import json
+import difflib
+
+from archive.update_publications import find_publication_items, parse_publication_li, generate_html_li
+from build_cache import write_file_atomic
+
+# Point CROSSREF_API at a local stand-in server to test without the network
+CROSSREF_API = os.environ.get('CROSSREF_API', 'https://api.crossref.org')
+CACHE_FILE = os.path.join('data', 'crossref_cache.json')
+USER_AGENT = 'gisynw.github.io publication updater (mailto:ywu@uca.edu)'
+SELECT_FIELDS = 'DOI,title,volume,issue,page,article-number,issued,container-title'
+
+# Journal names left by update_from_scholar.py when Scholar had none
+PLACEHOLDER_JOURNALS = {'', 'unknown journal'}
+
+DOI_PATTERN = re.compile(r'\b(10\.\d{4,9}/[^\s"<>?#]+)', re.IGNORECASE)
+
+def normalize_title(title):
+    """
+    Lower-case a title and strip tags/punctuation so variants compare equal
+    """
+    title = re.sub(r'<[^>]+>', '', title or '')
+    return re.sub(r'[\W_]+', ' ', title.lower()).strip()
+
+def extract_doi(url):
+    """
+    Return the DOI embedded in a URL (doi.org or publisher link), if any
+    """
+    if not url:
+        return None
+    match = DOI_PATTERN.search(url)
+    return match.group(1).rstrip('.').lower() if match else None
+
+class MetadataCache:
+    """
+    Persistent JSON cache of lookups; a None value records a lookup that found nothing
+    """
+
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = cache_file
+        self.entries = {}
+        self.dirty = False
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable metadata cache {cache_file}")
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_file_atomic(self.cache_file, json.dumps(self.entries, indent=2, sort_keys=True, ensure_ascii=False) + '\n')
+        self.dirty = False
+
+def make_session(pool_size=8):
+    """
+    Create a pooled HTTP session with retries on transient errors
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET']))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+def crossref_to_metadata(item):
+    """
+    Reduce a Crossref work item to the fields used by generate_html_li
+    """
+    issued = item.get('issued', {}).get('date-parts') or [[None]]
+    titles = item.get('title') or ['']
+    containers = item.get('container-title') or ['']
+    return {
+        'doi': (item.get('DOI') or '').lower() or None,
+        'title': titles[0],
+        'journal': containers[0],
+        'year': issued[0][0] if issued[0] else None,
+        'volume': item.get('volume') or '',
+        'issue': item.get('issue') or '',
+        'pages': item.get('page') or item.get('article-number') or ''
+    }
+
+def lookup_dois(session, dois, base_url=CROSSREF_API, timeout=20):
+    """
+    Fetch metadata for a batch of DOIs in one filtered request
+    Returns {doi: metadata}; DOIs Crossref does not know are absent
+    """
+    params = {
+        'filter': ','.join(f'doi:{doi}' for doi in dois),
+        'rows': len(dois),
+        'select': SELECT_FIELDS
+    }
+    response = session.get(f'{base_url}/works', params=params, timeout=timeout)
+    response.raise_for_status()
+    found = {}
+    for item in response.json().get('message', {}).get('items', []):
+        metadata = crossref_to_metadata(item)
+        if metadata['doi']:
+            found[metadata['doi']] = metadata
+    return found
+
+def lookup_title(session, title, year=None, base_url=CROSSREF_API, timeout=20):
+    """
+    Search by bibliographic title and return the best matching work, or None
+    """
+    params = {'query.bibliographic': re.sub(r'<[^>]+>', '', title), 'rows': 5, 'select': SELECT_FIELDS}
+    response = session.get(f'{base_url}/works', params=params, timeout=timeout)
+    response.raise_for_status()
+
+    wanted = normalize_title(title)
+    best, best_ratio = None, 0.0
+    for item in response.json().get('message', {}).get('items', []):
+        metadata = crossref_to_metadata(item)
+        ratio = difflib.SequenceMatcher(None, wanted, normalize_title(metadata['title'])).ratio()
+        if year and metadata['year'] and abs(int(year) - int(metadata['year'])) > 1:
+            continue
+        if ratio > best_ratio:
+            best, best_ratio = metadata, ratio
+    return best if best_ratio >= 0.9 else None
+
+def has_placeholder_journal(pub):
+    return (pub.get('journal') or '').strip().lower() in PLACEHOLDER_JOURNALS
+
+def apply_metadata(pub, metadata):
+    """
+    Fill only the fields that are missing on the publication; returns True if anything changed
+
+    The work's fields are taken as a set, and only when the publication is that
+    work: either it already links the same DOI, or it has no link and gets the
+    DOI along with them. A title match is never mixed into an entry that links
+    somewhere else.
+    """
+    if not metadata.get('doi'):
+        return False
+    linked = extract_doi(pub.get('doi_url'))
+    if pub.get('doi_url') and linked != metadata['doi']:
+        return False
+
+    changed = False
+    if not pub.get('doi_url'):
+        pub['doi_url'] = f"https://doi.org/{metadata['doi']}"
+        changed = True
+    if pub.get('type') != 'thesis':
+        if metadata.get('journal') and has_placeholder_journal(pub):
+            pub['journal'] = metadata['journal']
+            changed = True
+        for field in ('volume', 'issue', 'pages'):
+            if metadata.get(field) and not pub.get(field):
+                pub[field] = metadata[field]
+                changed = True
+    return changed
+
+def needs_enrichment(pub):
+    if pub.get('doi_url') and not extract_doi(pub['doi_url']):
+        # Links to a PDF or publisher page we cannot match a DOI against
+        return False
+    if pub.get('type') == 'thesis':
+        return not pub.get('doi_url')
+    return (not pub.get('doi_url') or not pub.get('volume') or not pub.get('pages')
+            or has_placeholder_journal(pub))
+
+def enrich_publications(publications, base_url=CROSSREF_API, cache_file=CACHE_FILE,
+                        batch_size=20, workers=4, session=None):
+    """
+    Fill missing DOI/journal/volume/issue/pages on publication dicts in place
+
+    Known DOIs are resolved in batched filter queries, the rest by title search
+    on a pooled session. Every answer, including "not found", is cached so a
+    title or DOI is only ever looked up once. Returns the number of updated entries.
+    """
+    cache = MetadataCache(cache_file)
+    pending = [pub for pub in publications if needs_enrichment(pub)]
+    if not pending:
+        return 0
+
+    by_doi = {}
+    by_title = {}
+    for pub in pending:
+        doi = extract_doi(pub.get('doi_url'))
+        if doi:
+            by_doi.setdefault(doi, []).append(pub)
+        else:
+            by_title.setdefault('title:' + normalize_title(pub['title']), []).append(pub)
+
+    uncached_dois = [doi for doi in by_doi if 'doi:' + doi not in cache]
+    uncached_titles = [key for key in by_title if key not in cache]
+
+    if uncached_dois or uncached_titles:
+        owns_session = session is None
+        try:
+            session = session or make_session(pool_size=workers)
+        except ImportError:
+            print("Error: requests is required for metadata lookups (pip install requests)")
+            return 0
+
+        try:
+            for start in range(0, len(uncached_dois), batch_size):
+                batch = uncached_dois[start:start + batch_size]
+                try:
+                    found = lookup_dois(session, batch, base_url)
+                except Exception as e:
+                    print(f"  Warning: DOI batch lookup failed: {e}")
+                    continue
+                for doi in batch:
+                    cache.put('doi:' + doi, found.get(doi))
+
+            from concurrent.futures import ThreadPoolExecutor
+
+            def search(key):
+                pub = by_title[key][0]
+                return key, lookup_title(session, pub['title'], pub.get('year'), base_url)
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(search, key) for key in uncached_titles]
+                for future in futures:
+                    try:
+                        key, metadata = future.result()
+                    except Exception as e:
+                        print(f"  Warning: title lookup failed: {e}")
+                        continue
+                    cache.put(key, metadata)
+        finally:
+            if owns_session:
+                session.close()
+            cache.save()
+
+    updated = 0
+    for key, pubs in [('doi:' + doi, pubs) for doi, pubs in by_doi.items()] + list(by_title.items()):
+        metadata = cache.get(key)
+        if not metadata:
+            continue
+        for pub in pubs:
+            if apply_metadata(pub, metadata):
+                updated += 1
+                print(f"  Enriched: {re.sub(r'<[^>]+>', '', pub['title'])[:50]}...")
+    return updated
+
+def enrich_html_file(html_file, base_url=CROSSREF_API, cache_file=CACHE_FILE):
+    """
+    Enrich the entries already in the publications list and rewrite only the changed lines
+    """
+    with open(html_file, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
+
+    located = find_publication_items(content)
+    if located is None:
+        print("Error: Could not find publications list in HTML file")
+        return False
+
+    entries = []
+    for _, line_start, line_end in located[2]:
+        line = content[line_start:line_end]
+        pub = parse_publication_li(line)
+        if pub:
+            entries.append((line_start, line_end, line, pub))
+
+    publications = [pub for _, _, _, pub in entries]
+    before = [dict(pub) for pub in publications]
+    if not enrich_publications(publications, base_url, cache_file):
+        print("No publications needed updating")
+        return True
+
+    pieces = []
+    cursor = 0
+    for (line_start, line_end, line, pub), original in zip(entries, before):
+        if pub == original:
+            continue
+        li_start = line.find('<li')
+        li_end = line.rfind('</li>') + len('</li>')
+        pieces.append(content[cursor:line_start])
+        pieces.append(line[:li_start] + generate_html_li(pub) + line[li_end:])
+        cursor = line_end
+    pieces.append(content[cursor:])
+
+    write_file_atomic(html_file, ''.join(pieces))
+    return True
+
+def main(base_url=CROSSREF_API):
+    html_file = 'index.html'
+    if not os.path.exists(html_file):
+        print(f"Error: {html_file} not found!")
+        return
+
+    print(f"Enriching publications in {html_file} from {base_url}...")
+    if enrich_html_file(html_file, base_url):
+        print(f"✅ {html_file} is up to date")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -5,9 +5,21 @@ Script to generate a professional CV from HTML content
 
 import re
 import os
-from bs4 import BeautifulSoup
+import sys
 from datetime import datetime
 
+from build_cache import BuildCache, FragmentCache, text_digest, file_digest, write_file_atomic
+from build_fonts import font_head, MANIFEST_FILE as FONT_MANIFEST
+
+# Cached CV fragments are only valid for the renderer that produced them
+RENDERER_DIGEST = file_digest(__file__)
+
+# Used only until the self-hosted subsets have been built with build_fonts.py. Loaded as
+# a print stylesheet and switched on when it arrives, so it never blocks the first paint;
+# without JavaScript the CV keeps the Helvetica/Arial fallbacks
+FALLBACK_FONTS = """<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Merriweather:wght@700&family=Open+Sans:ital,wght@0,300;0,400;0,700;1,400&display=swap" media="print" onload="this.media='all'">"""
+
 def extract_info_from_html(html_file):
     """
     Extract structured information from index.html using BeautifulSoup
@@ -15,6 +27,15 @@ def extract_info_from_html(html_file):
     with open(html_file, 'r', encoding='utf-8') as f:
         content = f.read()
     
+    return extract_info_from_content(content)
+
+def extract_info_from_content(content):
+    """
+    Extract structured information from the HTML text of index.html
+    """
+    # Imported here so cache-hit runs never pay for BeautifulSoup
+    from bs4 import BeautifulSoup
+    
     soup = BeautifulSoup(content, 'html.parser')
     
     # Extract name from title tag
@@ -108,16 +129,85 @@ def extract_info_from_html(html_file):
             
     return info
 
-def generate_cv_html(info):
+def split_dated_entry(entry):
     """
-    Generate the HTML for the CV
+    Split "2019–2024: Ph.D. ..." into its year and description
     """
+    # Try to split by first colon or common separator
+    parts = entry.split(':', 1)
+    if len(parts) == 2:
+        return parts[0].strip(), parts[1].strip()
+    return "", entry
+
+def render_items(rows, content_class="item-content"):
+    html = ""
+    for year, content in rows:
+        html += f"""
+        <div class="item">
+            <div class="item-year">{year}</div>
+            <div class="{content_class}">{content}</div>
+        </div>
+        """
+    return html
+
+def render_education(education):
+    # Parse Education strings to separate Year from Content if possible
+    # Strings format: "2019–2024: Ph.D. ..."
+    return render_items(split_dated_entry(edu) for edu in education)
+
+def render_appointments(appointments):
+    return render_items(split_dated_entry(appt) for appt in appointments)
+
+def render_publications(publications):
+    html = ""
+    for pub in publications:
+        html += f"""
+        <div class="item">
+            <div class="item-year">{pub['year']}</div>
+            <div class="item-content publication-item">
+                {pub['content']}
+            </div>
+        </div>
+        """
+    return html
+
+def render_awards(awards):
+    # Awards are now organized by year as a dictionary
+    return render_items((year, award_text)
+                        for year in sorted(awards.keys(), reverse=True)
+                        for award_text in awards[year])
+
+# Section renderers and the slice of `info` each one depends on
+SECTIONS = {
+    'education': (render_education, lambda info: info['education']),
+    'appointments': (render_appointments, lambda info: info['appointments']),
+    'publications': (render_publications,
+                     lambda info: [{'year': pub['year'], 'content': pub['content']} for pub in info['publications']]),
+    'awards': (render_awards, lambda info: info['awards']),
+}
+
+def render_section(name, info, fragments=None):
+    """
+    Render one CV section, reusing the cached fragment when its slice of `info` is unchanged
+    """
+    render, select = SECTIONS[name]
+    data = select(info)
+    if fragments is None:
+        return render(data)
+    # The renderer's source is part of the key so template edits invalidate fragments
+    return fragments.get_or_render(f'cv:{name}', [RENDERER_DIGEST, data], lambda: render(data))
+
+
+def generate_cv_html(info, fonts_html=None, fragments=None):
+    """
+    Generate the HTML for the CV; pass a FragmentCache to reuse unchanged sections
+    """
+    if not fonts_html:
+        fonts_html = FALLBACK_FONTS
     
     # CSS Styles
     css = """
     <style>
-        @import url('https://fonts.googleapis.com/css2?family=Merriweather:ital,wght@0,300;0,400;0,700;0,900;1,300;1,400&family=Open+Sans:ital,wght@0,300;0,400;0,600;0,700;1,400&display=swap');
-        
         body {
             font-family: 'Open Sans', Helvetica, Arial, sans-serif;
             color: #333;
@@ -251,6 +341,7 @@ def generate_cv_html(info):
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{info['name']} - Curriculum Vitae</title>
+    {fonts_html}
     {css}
 </head>
 <body>
@@ -272,24 +363,7 @@ def generate_cv_html(info):
     <section>
         <h2>Education</h2>
 """
-    # Parse Education strings to separate Year from Content if possible
-    # Strings format: "2019–2024: Ph.D. ..."
-    for edu in info['education']:
-        # Try to split by first colon or common separator
-        parts = edu.split(':', 1)
-        if len(parts) == 2:
-            year = parts[0].strip()
-            desc = parts[1].strip()
-        else:
-            year = ""
-            desc = edu
-            
-        html += f"""
-        <div class="item">
-            <div class="item-year">{year}</div>
-            <div class="item-content">{desc}</div>
-        </div>
-        """
+    html += render_section('education', info, fragments)
 
     html += """
     </section>
@@ -297,21 +371,7 @@ def generate_cv_html(info):
     <section>
         <h2>Academic Appointments</h2>
 """
-    for appt in info['appointments']:
-        parts = appt.split(':', 1)
-        if len(parts) == 2:
-            year = parts[0].strip()
-            desc = parts[1].strip()
-        else:
-            year = ""
-            desc = appt
-            
-        html += f"""
-        <div class="item">
-            <div class="item-year">{year}</div>
-            <div class="item-content">{desc}</div>
-        </div>
-        """
+    html += render_section('appointments', info, fragments)
 
     html += """
     </section>
@@ -319,15 +379,7 @@ def generate_cv_html(info):
     <section>
         <h2>Publications</h2>
 """
-    for pub in info['publications']:
-        html += f"""
-        <div class="item">
-            <div class="item-year">{pub['year']}</div>
-            <div class="item-content publication-item">
-                {pub['content']}
-            </div>
-        </div>
-        """
+    html += render_section('publications', info, fragments)
 
     html += """
     </section>
@@ -335,16 +387,7 @@ def generate_cv_html(info):
     <section>
         <h2>Grants & Awards</h2>
 """
-    # Awards are now organized by year as a dictionary
-    for year in sorted(info['awards'].keys(), reverse=True):
-        awards_list = info['awards'][year]
-        for award_text in awards_list:
-            html += f"""
-        <div class="item">
-            <div class="item-year">{year}</div>
-            <div class="item-content">{award_text}</div>
-        </div>
-        """
+    html += render_section('awards', info, fragments)
 
     html += """
     </section>
@@ -362,18 +405,46 @@ def generate_cv_html(info):
 """
     return html
 
-def main():
+def cv_fonts(output_file="cv.html"):
+    """
+    Self-hosted font block for the CV, with URLs relative to where it is written
+    """
+    return font_head('cv.html', base_dir=os.path.dirname(output_file) or '.')
+
+def cv_digest(content):
+    """
+    Build-cache digest of everything the CV depends on
+    """
+    # The footer shows the month, so a new month also counts as a change
+    fonts_digest = file_digest(FONT_MANIFEST) if os.path.exists(FONT_MANIFEST) else None
+    return text_digest('cv', content, RENDERER_DIGEST, fonts_digest, datetime.now().strftime('%Y-%m'))
+
+def main(html_file="index.html", output_file="cv.html", force=False):
     print("Generating Professional CV...")
-    info = extract_info_from_html("index.html")
+    
+    with open(html_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    cache = BuildCache()
+    digest = cv_digest(content)
+    if not force and cache.is_fresh(f'cv:{output_file}', digest, [output_file]):
+        print(f"✅ {output_file} is up to date")
+        return
+    
+    info = extract_info_from_content(content)
     
     print(f"Extracted: {len(info['education'])} Education, {len(info['appointments'])} Appointments, {len(info['publications'])} Publications")
     
-    cv_html = generate_cv_html(info)
+    fragments = FragmentCache()
+    cv_html = generate_cv_html(info, cv_fonts(output_file), fragments)
+    fragments.save()
+    print(f"Sections: {fragments.misses} rendered, {fragments.hits} reused from cache")
     
-    with open("cv.html", "w", encoding='utf-8') as f:
-        f.write(cv_html)
+    write_file_atomic(output_file, cv_html)
+    cache.record(f'cv:{output_file}', digest)
+    cache.save()
         
-    print("✅ Successfully generated cv.html")
+    print(f"✅ Successfully generated {output_file}")
 
 if __name__ == "__main__":
-    main()
+    main(force='--force' in sys.argv[1:])
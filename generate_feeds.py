@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Script to generate sitemap.xml, the publications Atom feed and the
+schema.org ScholarlyArticle JSON-LD in index.html from the publications list
+"""
+
+import os
+import re
+import sys
+import json
+import html
+from datetime import datetime, timezone
+
+from archive.update_publications import extract_publication_records
+from enrich_metadata import PLACEHOLDER_JOURNALS
+from build_cache import BuildCache, text_digest, file_digest, open_atomic, replace_marked_block, xml_escape as escape
+
+SITE_URL = "https://gisynw.github.io"
+AUTHOR_NAME = "Yanan Wu"
+PAGES = ['index.html', 'cv.html']
+FEED_FILE = 'publications.xml'
+SITEMAP_FILE = 'sitemap.xml'
+
+JSONLD_START = '<script type="application/ld+json" id="publications-jsonld">'
+JSONLD_END = '</script>'
+
+def strip_tags(markup):
+    """
+    Remove HTML tags and decode entities, giving the plain text of a fragment
+    """
+    return html.unescape(re.sub(r'<[^>]+>', '', markup)).strip()
+
+def journal_name(pub):
+    """
+    Plain journal name, or '' for a missing or placeholder one ("Unknown Journal")
+    """
+    journal = strip_tags(pub['journal'] or '')
+    return '' if journal.lower() in PLACEHOLDER_JOURNALS else journal
+
+def split_authors(authors_html):
+    """
+    Split an APA style author string ("Yang, Y., <b>Wu, Y.</b>, & Yuan, M.") into names
+    """
+    plain = strip_tags(authors_html)
+    return [f"{initials.strip()} {last.strip()}"
+            for last, initials in re.findall(r'([^,&]+?),\s*((?:[A-Z]\.(?:-[A-Z]\.)?\s*)+)', plain)]
+
+def page_url(page):
+    return SITE_URL + '/' if page == 'index.html' else f"{SITE_URL}/{page}"
+
+def publication_jsonld(records):
+    """
+    Build the schema.org graph describing every publication
+    """
+    graph = []
+    for pub in records:
+        item = {
+            "@type": "Thesis" if pub['type'] == 'thesis' else "ScholarlyArticle",
+            "headline": strip_tags(pub['title']),
+            "name": strip_tags(pub['title']),
+            "datePublished": str(pub['year']),
+            "author": [{"@type": "Person", "name": name} for name in split_authors(pub['authors'])]
+        }
+        if pub['doi_url']:
+            item["url"] = pub['doi_url']
+            if 'doi.org/' in pub['doi_url']:
+                item["sameAs"] = pub['doi_url']
+        journal = journal_name(pub)
+        if pub['type'] == 'thesis':
+            if journal:
+                item["inSupportOf"] = journal
+        elif journal:
+            item["isPartOf"] = {"@type": "Periodical", "name": journal}
+            if pub['volume']:
+                item["isPartOf"]["volumeNumber"] = pub['volume']
+            if pub['issue']:
+                item["isPartOf"]["issueNumber"] = pub['issue']
+        if pub['pages']:
+            item["pagination"] = pub['pages']
+        graph.append(item)
+
+    return {"@context": "https://schema.org", "@graph": graph}
+
+def update_jsonld(html_file, records):
+    """
+    Replace (or insert before </head>) the generated publications JSON-LD block
+    """
+    payload = json.dumps(publication_jsonld(records), indent=4, ensure_ascii=False).replace('</', '<\\/')
+    return replace_marked_block(html_file, JSONLD_START, JSONLD_END, payload,
+                                lambda content: content.find('</head>'), 'publications JSON-LD',
+                                indent='    ') is not None
+
+def write_feed(feed_file, records):
+    """
+    Stream the publications Atom feed to disk one entry at a time
+    """
+    # Derived from the records (not the clock) so an unchanged list gives an identical feed
+    newest = max((pub['year'] for pub in records), default=1970)
+    updated = f'{newest}-01-01T00:00:00Z'
+    with open_atomic(feed_file) as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write('<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        f.write(f'    <title>{escape(AUTHOR_NAME)} - Publications</title>\n')
+        f.write(f'    <id>{escape(page_url("index.html"))}#publications</id>\n')
+        f.write(f'    <link rel="alternate" href="{escape(page_url("index.html") + "#publications", quote=True)}"/>\n')
+        f.write(f'    <link rel="self" href="{escape(f"{SITE_URL}/{feed_file}", quote=True)}"/>\n')
+        f.write(f'    <author><name>{escape(AUTHOR_NAME)}</name></author>\n')
+        f.write(f'    <updated>{updated}</updated>\n')
+
+        for pub in records:
+            title = strip_tags(pub['title'])
+            entry_id = pub['doi_url'] or f"tag:{SITE_URL.split('//', 1)[1]},{pub['year']}:{text_digest(title)[:16]}"
+            f.write('    <entry>\n')
+            f.write(f'        <title>{escape(title)}</title>\n')
+            f.write(f'        <id>{escape(entry_id)}</id>\n')
+            if pub['doi_url']:
+                f.write(f'        <link href="{escape(pub["doi_url"], quote=True)}"/>\n')
+            f.write(f'        <updated>{pub["year"]}-01-01T00:00:00Z</updated>\n')
+            for name in split_authors(pub['authors']):
+                f.write(f'        <author><name>{escape(name)}</name></author>\n')
+            journal = journal_name(pub)
+            if journal:
+                f.write(f'        <summary>{escape(journal)}</summary>\n')
+            f.write('    </entry>\n')
+
+        f.write('</feed>\n')
+
+def page_lastmod(page):
+    """
+    Date the page's content last changed: today if it has uncommitted changes,
+    otherwise the date of the last commit that touched it. File mtimes are not
+    used because a fresh clone resets them to the checkout date.
+    """
+    import subprocess
+
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    try:
+        status = subprocess.run(['git', 'status', '--porcelain', '--', page],
+                                capture_output=True, text=True, check=True).stdout
+        if status.strip():
+            return today
+        committed = subprocess.run(['git', 'log', '-1', '--format=%cs', '--', page],
+                                   capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        committed = ''
+    return committed or today
+
+def write_sitemap(sitemap_file, pages):
+    """
+    Write sitemap.xml listing each page with its last modification date
+    """
+    with open_atomic(sitemap_file) as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for page in pages:
+            lastmod = page_lastmod(page)
+            f.write('    <url>\n')
+            f.write(f'        <loc>{escape(page_url(page))}</loc>\n')
+            f.write(f'        <lastmod>{lastmod}</lastmod>\n')
+            f.write('    </url>\n')
+        f.write('</urlset>\n')
+
+def build_outputs(html_file='index.html', force=False):
+    """
+    Regenerate the JSON-LD, feed and sitemap whose inputs changed since the last build
+    """
+    if not os.path.exists(html_file):
+        print(f"Error: {html_file} not found!")
+        return False
+
+    cache = BuildCache()
+
+    with open(html_file, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    records = extract_publication_records(html_content)
+    print(f"Extracted {len(records)} publication records from {html_file}")
+
+    # The renderer's own source is part of the key, so template edits rebuild the outputs
+    records_digest = text_digest(records, file_digest(__file__))
+
+    # JSON-LD lives inside index.html, so check the block is still there as well
+    has_jsonld = JSONLD_START in html_content
+    jsonld_digest = text_digest('jsonld', records_digest)
+    if force or not has_jsonld or not cache.is_fresh('jsonld', jsonld_digest):
+        if not update_jsonld(html_file, records):
+            return False
+        cache.record('jsonld', jsonld_digest)
+        print(f"  Updated publications JSON-LD in {html_file}")
+    else:
+        print("  JSON-LD up to date")
+
+    feed_digest = text_digest('feed', records_digest)
+    if force or not cache.is_fresh('feed', feed_digest, [FEED_FILE]):
+        write_feed(FEED_FILE, records)
+        cache.record('feed', feed_digest)
+        print(f"  Wrote {FEED_FILE}")
+    else:
+        print(f"  {FEED_FILE} up to date")
+
+    # Sitemap depends on the pages themselves, so it is checked after the JSON-LD step
+    pages = [page for page in PAGES if os.path.exists(page)]
+    sitemap_digest = text_digest('sitemap', [(page, file_digest(page)) for page in pages])
+    if force or not cache.is_fresh('sitemap', sitemap_digest, [SITEMAP_FILE]):
+        write_sitemap(SITEMAP_FILE, pages)
+        cache.record('sitemap', sitemap_digest)
+        print(f"  Wrote {SITEMAP_FILE}")
+    else:
+        print(f"  {SITEMAP_FILE} up to date")
+
+    cache.save()
+    return True
+
+def main(force=False):
+    print("Generating sitemap, publications feed and JSON-LD...")
+    if build_outputs(force=force):
+        print("✅ Build outputs are up to date")
+
+if __name__ == "__main__":
+    main(force='--force' in sys.argv[1:])
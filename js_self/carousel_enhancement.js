@@ -87,6 +87,53 @@ $(document).ready(function() {
     $carousel.on('slide.bs.carousel', function() {
         $('.carousel-inner .item').css('transition', 'all 0.6s ease-in-out');
     });
+    
+    // Lazy-load slide images: the markup ships blurred placeholders
+    // (see build_thumbnails.py) and the real image is fetched on demand
+    function loadSlide($item) {
+        $item.find('img.lazy-slide[data-src]').each(function() {
+            var img = this;
+            img.onload = function() {
+                $(img).addClass('loaded');
+            };
+            if (img.getAttribute('data-srcset')) {
+                img.setAttribute('srcset', img.getAttribute('data-srcset'));
+            }
+            img.src = img.getAttribute('data-src');
+            img.removeAttribute('data-src');
+            img.removeAttribute('data-srcset');
+        });
+    }
+    
+    function loadAround($item) {
+        var $next = $item.next('.item');
+        loadSlide($item);
+        loadSlide($next.length ? $next : $carousel.find('.item').first());
+    }
+    
+    var carouselVisible = false;
+    
+    if ('IntersectionObserver' in window) {
+        var observer = new IntersectionObserver(function(entries) {
+            entries.forEach(function(entry) {
+                carouselVisible = entry.isIntersecting;
+                if (entry.isIntersecting) {
+                    loadAround($carousel.find('.item.active'));
+                }
+            });
+        }, { rootMargin: '200px 0px' });
+        observer.observe($carousel[0]);
+    } else {
+        carouselVisible = true;
+        loadSlide($carousel.find('.item'));
+    }
+    
+    // Fetch the incoming slide (and the one after it) as the carousel moves
+    $carousel.on('slide.bs.carousel', function(e) {
+        if (carouselVisible && e.relatedTarget) {
+            loadAround($(e.relatedTarget));
+        }
+    });
 });
 
 // Add CSS for clicked state
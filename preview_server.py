@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Local preview server: serves index.html and a CV rendered in memory, and
+reloads the browser over Server-Sent Events whenever a source file changes
+
+Nothing is written to disk until /__build is requested (or generate_cv.py is run).
+"""
+
+import os
+import sys
+import time
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from build_cache import BuildCache, FragmentCache, text_digest, write_file_atomic
+
+WATCH_PATHS = ['index.html', 'css_self', 'js_self', 'generate_cv.py', os.path.join('fonts', 'subset', 'manifest.json')]
+POLL_INTERVAL = 0.05
+
+RELOAD_SCRIPT = """<script>
+(function() {
+    var source = new EventSource('/__livereload');
+    source.onmessage = function() { location.reload(); };
+})();
+</script>
+"""
+
+def inject_reload_script(html):
+    """
+    Add the live reload client right before </body>
+    """
+    end = html.rfind('</body>')
+    if end == -1:
+        return html + RELOAD_SCRIPT
+    return html[:end] + RELOAD_SCRIPT + html[end:]
+
+class SiteModel:
+    """
+    In-memory copy of index.html and the CV rendered from it
+    """
+
+    def __init__(self, html_file='index.html'):
+        self.html_file = html_file
+        self.version = 0
+        self.index_html = ''
+        self.cv_html = ''
+        # The index.html content the current CV was rendered from
+        self.cv_source = ''
+        self.index_digest = None
+        self.fragments = FragmentCache()
+        self.mtimes = {}
+        self.changed = threading.Condition()
+        # Held while rendering/committing the CV and during build(), which runs on a
+        # request thread: the fragment cache and the cv_source/cv_html pair change together
+        self.lock = threading.Lock()
+        self.refresh()
+
+    def snapshot_mtimes(self):
+        mtimes = {}
+        for path in WATCH_PATHS:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    for name in files:
+                        full = os.path.join(root, name)
+                        mtimes[full] = os.stat(full).st_mtime_ns
+            elif os.path.exists(path):
+                mtimes[path] = os.stat(path).st_mtime_ns
+        return mtimes
+
+    def refresh(self):
+        """
+        Re-read changed sources; the CV is only re-rendered when index.html's content changed
+        """
+        mtimes = self.snapshot_mtimes()
+        if mtimes == self.mtimes:
+            return False
+        changed_paths = {path for path in set(mtimes) | set(self.mtimes) if mtimes.get(path) != self.mtimes.get(path)}
+        self.mtimes = mtimes
+
+        started = time.perf_counter()
+        rendered = False
+        with self.lock:
+            if 'generate_cv.py' in changed_paths:
+                import importlib
+                try:
+                    import generate_cv
+                    importlib.reload(generate_cv)
+                    self.index_digest = None
+                except Exception as e:
+                    # Saved mid-edit: keep the last good renderer and CV until the next save
+                    print(f"Warning: could not reload generate_cv.py: {e}")
+            if WATCH_PATHS[-1] in changed_paths:
+                # Rebuilt font subsets change the CV's <head>
+                self.index_digest = None
+
+            with open(self.html_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            digest = text_digest(content)
+            if digest != self.index_digest:
+                cv_html, cv_source = self.cv_html, self.cv_source
+                try:
+                    from generate_cv import extract_info_from_content, generate_cv_html, cv_fonts
+                    # Reads the on-disk fragments of generate_cv.py, so only edited sections
+                    # re-render; new fragments stay in memory until build()
+                    cv_html = generate_cv_html(extract_info_from_content(content), cv_fonts(), self.fragments)
+                    cv_source = content
+                except Exception as e:
+                    # Keep serving the last good CV while the page is mid-edit
+                    print(f"Warning: could not render CV: {e}")
+                self.index_html = content
+                self.cv_html, self.cv_source = cv_html, cv_source
+                self.index_digest = digest
+                rendered = True
+
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+        elapsed = (time.perf_counter() - started) * 1000
+        what = 'index.html + cv.html' if rendered else ', '.join(sorted(changed_paths))
+        print(f"  Reloaded {what} in {elapsed:.0f} ms")
+        return True
+
+    def wait_for_change(self, version, timeout):
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version, timeout=timeout)
+            return self.version
+
+    def watch(self):
+        while True:
+            time.sleep(POLL_INTERVAL)
+            try:
+                self.refresh()
+            except Exception as e:
+                # The watcher must outlive any single bad save
+                print(f"Warning: {e}")
+
+    def build(self):
+        """
+        Explicit build: write the in-memory CV to cv.html and persist its fragments,
+        recording it in the build cache just as generate_cv.py would
+        """
+        from generate_cv import cv_digest
+        with self.lock:
+            write_file_atomic('cv.html', self.cv_html)
+            self.fragments.save()
+            cache = BuildCache()
+            cache.record('cv:cv.html', cv_digest(self.cv_source))
+            cache.save()
+        print("✅ Wrote cv.html")
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the in-memory pages, the SSE reload stream and static files from disk
+    """
+
+    def __init__(self, *args, model=None, **kwargs):
+        self.model = model
+        super().__init__(*args, **kwargs)
+
+    def send_html(self, html):
+        body = inject_reload_script(html).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path in ('/', '/index.html'):
+            self.send_html(self.model.index_html)
+        elif path == '/cv.html':
+            self.send_html(self.model.cv_html)
+        elif path == '/__livereload':
+            self.stream_reloads()
+        else:
+            super().do_GET()
+
+    def do_POST(self):
+        if self.path == '/__build':
+            self.model.build()
+            self.send_response(204)
+            self.end_headers()
+        else:
+            self.send_error(404)
+
+    def end_headers(self):
+        if not self.path.startswith('/__'):
+            self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def stream_reloads(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        version = self.model.version
+        try:
+            while True:
+                new_version = self.model.wait_for_change(version, timeout=15)
+                if new_version != version:
+                    version = new_version
+                    self.wfile.write(f'data: {version}\n\n'.encode('ascii'))
+                else:
+                    # Comment line keeps idle connections open
+                    self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+def main(port=8000):
+    if not os.path.exists('index.html'):
+        print("Error: index.html not found!")
+        return
+
+    print("Loading site into memory...")
+    model = SiteModel()
+    threading.Thread(target=model.watch, daemon=True).start()
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), partial(PreviewHandler, model=model, directory=os.getcwd()))
+    server.daemon_threads = True
+    print(f"Previewing on http://127.0.0.1:{port}/ (cv at /cv.html, POST /__build to write cv.html)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Service worker and precache manifest for the content-addressed build in dist/
+
+The manifest lists every file the build produced with its content hash. The
+worker precaches the pages, stylesheets, scripts and fonts, caches images on
+first use, and on each new build refetches only the entries whose hash
+changed. sw.js embeds the manifest itself, so any change to the pages or
+their assets makes browsers pick up the new worker, and the worker only
+handles URLs listed in it.
+"""
+
+import os
+import json
+
+from build_cache import text_digest, write_file_atomic
+
+SW_FILE = 'sw.js'
+PRECACHE_MANIFEST = 'precache-manifest.json'
+
+# Large media is cached when first requested rather than on install
+RUNTIME_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.pdf', '.mp4', '.pptx', '.zip'}
+
+REGISTER_SNIPPET = """<script>
+        if ('serviceWorker' in navigator) {
+            window.addEventListener('load', function() {
+                navigator.serviceWorker.register('sw.js');
+            });
+        }
+    </script>"""
+
+SW_TEMPLATE = """// Generated by service_worker.py - do not edit
+const VERSION = '__VERSION__';
+const CACHE = 'site-precache';
+const RUNTIME = 'site-runtime';
+const MANIFEST = __MANIFEST__;
+
+function cacheKey(entry) {
+    // Content-hashed files are already unique; other files are keyed by revision
+    return new URL(entry.url + (entry.hashed ? '' : '?__rev=' + entry.revision), self.location).href;
+}
+
+// Only URLs this build produced are handled; everything else on the origin
+// (including other sites under the same host) goes straight to the network
+const BY_URL = new Map(MANIFEST.files.map(function(entry) {
+    return [new URL(entry.url, self.location).href, entry];
+}));
+
+self.addEventListener('install', function(event) {
+    event.waitUntil(caches.open(CACHE).then(function(cache) {
+        return Promise.all(MANIFEST.files.filter(function(entry) {
+            return entry.precache;
+        }).map(function(entry) {
+            const key = cacheKey(entry);
+            return cache.match(key).then(function(hit) {
+                if (hit) {
+                    return null;
+                }
+                return fetch(entry.url, {cache: 'reload'}).then(function(response) {
+                    if (response.ok) {
+                        return cache.put(key, response);
+                    }
+                });
+            });
+        }));
+    }).then(function() {
+        return self.skipWaiting();
+    }));
+});
+
+self.addEventListener('activate', function(event) {
+    // Drop cached entries whose hash is no longer in the manifest
+    const current = new Set(MANIFEST.files.map(cacheKey));
+    event.waitUntil(Promise.all([CACHE, RUNTIME].map(function(name) {
+        return caches.open(name).then(function(cache) {
+            return cache.keys().then(function(requests) {
+                return Promise.all(requests.filter(function(request) {
+                    return !current.has(request.url);
+                }).map(function(request) {
+                    return cache.delete(request);
+                }));
+            });
+        });
+    })).then(function() {
+        return self.clients.claim();
+    }));
+});
+
+self.addEventListener('fetch', function(event) {
+    if (event.request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(event.request.url);
+    if (url.pathname.endsWith('/')) {
+        url.pathname += 'index.html';
+    }
+    url.search = '';
+    url.hash = '';
+    const entry = BY_URL.get(url.href);
+    if (!entry) {
+        return;
+    }
+
+    const key = cacheKey(entry);
+    event.respondWith(caches.match(key).then(function(hit) {
+        return hit || fetch(event.request).then(function(response) {
+            if (response.ok) {
+                const copy = response.clone();
+                caches.open(entry.precache ? CACHE : RUNTIME).then(function(cache) {
+                    cache.put(key, copy);
+                });
+            }
+            return response;
+        });
+    }));
+});
+"""
+def build_precache_manifest(files):
+    """
+    files: {dist-relative url: (content hash, size, hashed name?)}
+    Returns the manifest dict; its version changes whenever any file's hash does
+    """
+    entries = []
+    for url in sorted(files):
+        revision, size, hashed = files[url]
+        ext = os.path.splitext(url)[1].lower()
+        entries.append({
+            'url': url,
+            'revision': revision[:16],
+            'size': size,
+            'hashed': hashed,
+            'precache': ext not in RUNTIME_EXTENSIONS
+        })
+    return {'version': text_digest('precache', entries)[:16], 'files': entries}
+
+def render_service_worker(manifest):
+    """
+    sw.js with the manifest inlined, so the worker never waits on a network
+    round-trip before it can answer from the cache
+    """
+    return (SW_TEMPLATE.replace('__VERSION__', manifest['version'])
+            .replace('__MANIFEST__', json.dumps(manifest, separators=(',', ':'))))
+
+def write_if_changed(path, content):
+    """
+    Write only when the content differs, so unchanged builds leave the files untouched
+    """
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == content:
+                return False
+    write_file_atomic(path, content)
+    return True
+
+def write_service_worker(dist_dir, files):
+    """
+    Write the precache manifest and sw.js into dist_dir; returns the manifest
+    """
+    manifest = build_precache_manifest(files)
+    write_if_changed(os.path.join(dist_dir, PRECACHE_MANIFEST), json.dumps(manifest, indent=2) + '\n')
+    write_if_changed(os.path.join(dist_dir, SW_FILE), render_service_worker(manifest))
+    return manifest
+
+def add_registration(html):
+    """
+    Insert the service worker registration before </body> (once)
+    """
+    if "serviceWorker.register('sw.js')" in html:
+        return html
+    body_end = html.rfind('</body>')
+    if body_end == -1:
+        return html
+    return html[:body_end] + '    ' + REGISTER_SNIPPET + '\n' + html[body_end:]
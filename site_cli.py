@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Single command-line entry point for the site build scripts
+
+Each subcommand imports its module only when it runs, so `--help`, no-op
+incremental builds and cache hits never load BeautifulSoup, scholarly,
+NumPy, Pillow or requests.
+
+    python site_cli.py feeds
+    python site_cli.py cv --force
+    python site_cli.py scholar --id xVDuszoAAAAJ
+    python site_cli.py scholar --id xVDuszoAAAAJ <id> <id>
+"""
+
+import sys
+import argparse
+
+DEFAULT_SCHOLAR_ID = "xVDuszoAAAAJ"
+
+def cmd_scholar(args):
+    from update_from_scholar import main
+    main(*args.id, workers=args.workers)
+
+def cmd_cv(args):
+    from generate_cv import main
+    main(args.html, args.output, force=args.force)
+
+def cmd_feeds(args):
+    from generate_feeds import main
+    main(force=args.force)
+
+def cmd_chart(args):
+    from citation_metrics import main
+    main(args.id, force=args.force)
+
+def cmd_teaching(args):
+    from teaching_stats import main, DATA_FILE
+    main(args.data or DATA_FILE, force=args.force)
+
+def cmd_enrich(args):
+    from enrich_metadata import main, CROSSREF_API
+    main(args.api or CROSSREF_API)
+
+def cmd_thumbnails(args):
+    from build_thumbnails import main
+    main(force=args.force)
+
+def cmd_fonts(args):
+    from build_fonts import main
+    main(force=args.force)
+
+def cmd_assets(args):
+    from asset_store import main
+    main(strict=args.strict)
+
+def cmd_budget(args):
+    from check_budget import main
+    main(args.dir, args.budget, args.quiet)
+
+def cmd_preview(args):
+    from preview_server import main
+    main(args.port)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='site_cli.py', description="Build tools for gisynw.github.io")
+    subparsers = parser.add_subparsers(title='commands', metavar='<command>')
+
+    sub = subparsers.add_parser('scholar', help="add new publications from Google Scholar")
+    sub.add_argument('--id', nargs='+', default=[DEFAULT_SCHOLAR_ID],
+                     help="Google Scholar author id(s); several ids harvest a multi-author list")
+    sub.add_argument('--workers', type=int, default=4, help="worker threads for parsing and snapshots (Scholar requests are serialized)")
+    sub.set_defaults(func=cmd_scholar)
+
+    sub = subparsers.add_parser('cv', help="render cv.html from index.html")
+    sub.add_argument('--html', default='index.html')
+    sub.add_argument('--output', default='cv.html')
+    sub.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    sub.set_defaults(func=cmd_cv)
+
+    sub = subparsers.add_parser('feeds', help="update sitemap.xml, publications.xml and JSON-LD")
+    sub.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    sub.set_defaults(func=cmd_feeds)
+
+    sub = subparsers.add_parser('chart', help="render the citations-over-time chart")
+    sub.add_argument('--id', default=DEFAULT_SCHOLAR_ID, help="Google Scholar author id")
+    sub.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    sub.set_defaults(func=cmd_chart)
+
+    sub = subparsers.add_parser('teaching', help="render the course-evaluation chart into #teaching")
+    sub.add_argument('--data', help="evaluation CSV or JSON file")
+    sub.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    sub.set_defaults(func=cmd_teaching)
+
+    sub = subparsers.add_parser('enrich', help="fill missing DOIs and citation fields from Crossref")
+    sub.add_argument('--api', help="Crossref-compatible API base URL")
+    sub.set_defaults(func=cmd_enrich)
+
+    sub = subparsers.add_parser('thumbnails', help="build carousel thumbnails and placeholders")
+    sub.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    sub.set_defaults(func=cmd_thumbnails)
+
+    sub = subparsers.add_parser('fonts', help="build self-hosted, subsetted WOFF2 fonts")
+    sub.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    sub.set_defaults(func=cmd_fonts)
+
+    sub = subparsers.add_parser('assets', help="build dist/ with content-hashed, deduplicated assets")
+    sub.add_argument('--strict', action='store_true', help="fail if the pages reference missing files")
+    sub.set_defaults(func=cmd_assets)
+
+    sub = subparsers.add_parser('budget', help="check page weight against budget.json")
+    sub.add_argument('--dir', default='.', help="directory holding the built pages (e.g. dist)")
+    sub.add_argument('--budget', default='budget.json', help="budget file")
+    sub.add_argument('--quiet', action='store_true', help="only show the breakdown for failing pages")
+    sub.set_defaults(func=cmd_budget)
+
+    sub = subparsers.add_parser('preview', help="serve the site with live reload")
+    sub.add_argument('--port', type=int, default=8000)
+    sub.set_defaults(func=cmd_preview)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not hasattr(args, 'func'):
+        parser.print_help()
+        return 1
+    args.func(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
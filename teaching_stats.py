@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Build step that aggregates course-evaluation data and renders a static SVG
+chart of mean ratings per course into the #teaching section of index.html
+
+The data file (CSV or JSON) has one row per rating, or per rating with a
+response count:
+
+    term,course,item,rating,count
+    Fall 2024,GEOG 3325,Overall course,5,12
+
+`count` is optional (default 1) and ratings are on a 1-5 scale. JSON files hold
+a list of objects with the same fields.
+"""
+
+import os
+import sys
+import csv
+import json
+
+from build_cache import BuildCache, text_digest, file_digest, replace_marked_block, xml_escape as escape
+
+DATA_FILE = os.path.join('data', 'teaching_evaluations.csv')
+SCALE = 5
+
+CHART_START = '<!-- teaching-chart:start -->'
+CHART_END = '<!-- teaching-chart:end -->'
+
+def read_rows(data_file):
+    """
+    Return the evaluation rows of a CSV or JSON file as a list of dicts
+    """
+    if data_file.endswith('.json'):
+        with open(data_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open(data_file, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def load_evaluations(rows):
+    """
+    Turn evaluation rows into NumPy column arrays, dropping rows without a course or rating
+    """
+    import numpy as np
+
+    rows = [row for row in rows if row.get('course') and row.get('rating') not in (None, '')]
+    return {
+        'term': np.array([str(row.get('term') or '') for row in rows], dtype=str),
+        'course': np.array([str(row['course']).strip() for row in rows], dtype=str),
+        'rating': np.array([float(row['rating']) for row in rows], dtype=np.float64),
+        'count': np.array([int(row.get('count') or 1) for row in rows], dtype=np.int64)
+    }
+
+def aggregate_by(keys, ratings, counts):
+    """
+    Vectorised group-by: weighted mean rating and response count per distinct key
+    Returns (keys, means, responses, distribution) with distribution[i, r - 1] the
+    number of responses giving rating r
+    """
+    import numpy as np
+
+    groups, inverse = np.unique(keys, return_inverse=True)
+    responses = np.bincount(inverse, weights=counts, minlength=len(groups))
+    totals = np.bincount(inverse, weights=ratings * counts, minlength=len(groups))
+    means = np.divide(totals, responses, out=np.zeros_like(totals), where=responses > 0)
+
+    buckets = np.clip(np.rint(ratings).astype(np.int64), 1, SCALE) - 1
+    distribution = np.zeros((len(groups), SCALE), dtype=np.int64)
+    np.add.at(distribution, (inverse, buckets), counts)
+    return groups, means, responses.astype(np.int64), distribution
+
+def render_chart_svg(courses, means, responses, distribution, overall, width=640, row_height=30, label_width=210):
+    """
+    Render mean rating per course as horizontal bars with a rating-distribution strip
+    """
+    import numpy as np
+
+    padding = 24
+    height = padding * 2 + row_height * len(courses) + 10
+    bar_width = width - label_width - 110
+    colors = ['#c0392b', '#e67e22', '#f1c40f', '#7fb3d5', '#2980b9']
+
+    rows = []
+    for i, course in enumerate(courses):
+        y = padding + i * row_height
+        length = means[i] * bar_width / SCALE
+        shares = distribution[i] / max(int(distribution[i].sum()), 1)
+        offsets = np.concatenate(([0.0], np.cumsum(shares)[:-1])) * bar_width
+        strip = ''.join(
+            f'<rect x="{label_width + offset:.1f}" y="{y + 18}" width="{share * bar_width:.1f}" height="4" fill="{color}"/>'
+            for offset, share, color in zip(offsets, shares, colors) if share > 0
+        )
+        rows.append(
+            f'<text x="{label_width - 10}" y="{y + 13}" font-size="13" fill="#333" text-anchor="end">{escape(course)}</text>'
+            f'<rect x="{label_width}" y="{y}" width="{bar_width}" height="16" fill="#ecf0f1"/>'
+            f'<rect x="{label_width}" y="{y}" width="{length:.1f}" height="16" fill="#2980b9">'
+            f'<title>{escape(course)}: {means[i]:.2f} / {SCALE} from {responses[i]} responses</title></rect>'
+            f'{strip}'
+            f'<text x="{label_width + bar_width + 8}" y="{y + 13}" font-size="13" fill="#2c3e50">'
+            f'{means[i]:.2f} <tspan fill="#999">(n={responses[i]})</tspan></text>'
+        )
+
+    overall_x = label_width + overall * bar_width / SCALE
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="100%" '
+        f'role="img" aria-label="Course evaluations: mean rating {overall:.2f} out of {SCALE}">'
+        f'<text x="{label_width}" y="{padding - 8}" font-size="12" fill="#777">Mean rating (1-{SCALE})</text>'
+        f'{"".join(rows)}'
+        f'<line x1="{overall_x:.1f}" y1="{padding - 4}" x2="{overall_x:.1f}" y2="{height - padding}" '
+        f'stroke="#2c3e50" stroke-dasharray="3 3"><title>All courses: {overall:.2f}</title></line>'
+        f'</svg>'
+    )
+
+def update_chart_in_html(html_file, svg):
+    """
+    Replace the chart between the teaching-chart markers, adding the markers
+    before the course list of the #teaching section the first time
+    """
+    def before_course_list(content):
+        section = content.find('<section id="teaching"')
+        section_end = content.find('</section>', section) if section != -1 else -1
+        if section_end == -1:
+            return None
+        course_list = content.find('<!-- Course list -->', section, section_end)
+        return course_list if course_list != -1 else section_end
+
+    chart = f'<div id="teaching-chart" style="max-width: 720px; margin: 2rem auto;">{svg}</div>'
+    return replace_marked_block(html_file, CHART_START, CHART_END, chart,
+                                before_course_list, 'teaching chart') is not None
+
+def build_chart(html_file='index.html', data_file=DATA_FILE, force=False):
+    """
+    Re-render the teaching chart when the evaluation data has changed
+    """
+    if not os.path.exists(data_file):
+        print(f"No evaluation data ({data_file} not found), skipping teaching chart")
+        return True
+
+    cache = BuildCache()
+    digest = text_digest('teaching-chart', file_digest(data_file), file_digest(__file__))
+    with open(html_file, 'r', encoding='utf-8') as f:
+        has_chart = CHART_START in f.read()
+    if not force and has_chart and cache.is_fresh('teaching-chart', digest):
+        print("  Teaching chart up to date")
+        return True
+
+    rows = read_rows(data_file)
+    if not rows:
+        print(f"No evaluation rows in {data_file}, skipping teaching chart")
+        return True
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("Error: numpy is required to render the teaching chart (pip install numpy)")
+        return False
+
+    evaluations = load_evaluations(rows)
+
+    courses, means, responses, distribution = aggregate_by(
+        evaluations['course'], evaluations['rating'], evaluations['count'])
+    overall = float(np.average(evaluations['rating'], weights=evaluations['count']))
+
+    # Best-rated courses first
+    order = np.argsort(-means, kind='stable')
+    svg = render_chart_svg(courses[order], means[order], responses[order], distribution[order], overall)
+    if not update_chart_in_html(html_file, svg):
+        return False
+
+    cache.record('teaching-chart', digest)
+    cache.save()
+    terms = len(np.unique(evaluations['term']))
+    print(f"  Rendered teaching chart for {len(courses)} courses over {terms} terms "
+          f"({int(responses.sum())} responses, {len(svg) // 1024 + 1} KB) into {html_file}")
+    return True
+
+def main(data_file=DATA_FILE, force=False):
+    print(f"Rendering teaching statistics from {data_file}")
+    build_chart(data_file=data_file, force=force)
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    main(*args[:1], force='--force' in sys.argv[1:])
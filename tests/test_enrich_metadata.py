@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+enrich_metadata.py against a local stand-in for the Crossref API
+
+Run from the repository root with `python -m pytest tests` or
+`python -m unittest discover tests`.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enrich_metadata import enrich_publications
+
+WORKS = [
+    {'DOI': '10.1111/TGIS.70145', 'title': ['Mapping flood exposure with open data'],
+     'container-title': ['Transactions in GIS'], 'volume': '29', 'issue': '7', 'page': 'e70145',
+     'issued': {'date-parts': [[2025]]}},
+    {'DOI': '10.3390/ijgi9020010', 'title': ['Analyze emergency response with network models'],
+     'container-title': ['ISPRS International Journal of Geo-Information'], 'volume': '9', 'issue': '2',
+     'page': '10-20', 'issued': {'date-parts': [[2020]]}},
+]
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers /works filter and query.bibliographic requests from WORKS
+    """
+    requests = []
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        self.requests.append(query)
+        if 'filter' in query:
+            wanted = {part.split(':', 1)[1].lower() for part in query['filter'][0].split(',')}
+            items = [work for work in WORKS if work['DOI'].lower() in wanted]
+        else:
+            words = set(query['query.bibliographic'][0].lower().split())
+            items = [work for work in WORKS if words & set(work['title'][0].lower().split())]
+        body = json.dumps({'message': {'items': items}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def publication(title, year, journal, doi_url=None, **fields):
+    pub = {'authors': 'Wu, Y.', 'year': year, 'title': title, 'journal': journal,
+           'volume': '', 'issue': '', 'pages': '', 'doi_url': doi_url, 'type': 'journal'}
+    pub.update(fields)
+    return pub
+
+class EnrichPublicationsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInHandler.requests = []
+        self.tmp = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.tmp, 'crossref_cache.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def enrich(self, publications):
+        return enrich_publications(publications, base_url=self.base_url, cache_file=self.cache_file, workers=2)
+
+    def test_title_match_fills_doi_and_journal_together(self):
+        pub = publication('Analyze emergency response with network models', 2020, 'Unknown Journal')
+        self.assertEqual(self.enrich([pub]), 1)
+        self.assertEqual(pub['doi_url'], 'https://doi.org/10.3390/ijgi9020010')
+        self.assertEqual(pub['journal'], 'ISPRS International Journal of Geo-Information')
+        self.assertEqual((pub['volume'], pub['issue'], pub['pages']), ('9', '2', '10-20'))
+
+    def test_entry_linking_elsewhere_is_left_alone(self):
+        pdf = 'https://cartogis.org/docs/autocarto/2020/docs/Analyze_emergency_response.pdf'
+        pub = publication('Analyze emergency response with network models', 2020, 'Unknown Journal', pdf)
+        original = dict(pub)
+        self.assertEqual(self.enrich([pub]), 0)
+        self.assertEqual(pub, original)
+        self.assertEqual(StandInHandler.requests, [])
+
+    def test_doi_lookup_fills_missing_fields_only(self):
+        pub = publication('Mapping flood exposure with open data', 2025, 'Transactions in GIS',
+                          'https://doi.org/10.1111/tgis.70145', volume='29')
+        self.assertEqual(self.enrich([pub]), 1)
+        self.assertEqual((pub['journal'], pub['volume'], pub['issue'], pub['pages']),
+                         ('Transactions in GIS', '29', '7', 'e70145'))
+        self.assertEqual(len(StandInHandler.requests), 1)
+        self.assertIn('filter', StandInHandler.requests[0])
+
+    def test_answers_are_cached(self):
+        title = 'Analyze emergency response with network models'
+        self.enrich([publication('Unrelated title nobody published', 2019, 'Unknown Journal')])
+        self.enrich([publication(title, 2020, 'Unknown Journal')])
+        StandInHandler.requests = []
+
+        pubs = [publication('Unrelated title nobody published', 2019, 'Unknown Journal'),
+                publication(title, 2020, 'Unknown Journal')]
+        self.assertEqual(self.enrich(pubs), 1)
+        self.assertEqual(StandInHandler.requests, [])
+        self.assertEqual(pubs[0]['doi_url'], None)
+
+if __name__ == '__main__':
+    unittest.main()
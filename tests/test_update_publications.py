@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+In-place insertion of new entries into the publications list (archive/update_publications.py)
+
+Run from the repository root with `python -m pytest tests` or
+`python -m unittest discover tests`.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from archive.update_publications import update_html_file, find_publication_items
+
+def li(year, title):
+    return f'<li class="margin-10">Wu, Y. ({year}). <a href="#" target="_blank">{title}</a>. <em>Journal</em>.</li>'
+
+def page(items, newline='\n'):
+    lines = ['<html>', '<body>', '    <ul id="publications-list">']
+    lines += [f'        {item}' for item in items]
+    lines += ['    </ul>', '</body>', '</html>', '']
+    return newline.join(lines)
+
+class UpdateHtmlFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.html_file = os.path.join(self.tmp, 'index.html')
+        self.existing = [li(2023, 'A'), li(2021, 'B'), li(2021, 'C'), li(2019, 'D')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, content):
+        with open(self.html_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+
+    def read(self):
+        with open(self.html_file, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def titles(self):
+        content = self.read()
+        return [content[line_start:line_end].split('>')[2].split('<')[0]
+                for _, line_start, line_end in find_publication_items(content)[2]]
+
+    def test_same_year_goes_after_existing_entries(self):
+        self.write(page(self.existing))
+        self.assertTrue(update_html_file(self.html_file, [li(2021, 'N')]))
+        self.assertEqual(self.titles(), ['A', 'B', 'C', 'N', 'D'])
+
+    def test_insert_at_head_and_tail(self):
+        self.write(page(self.existing))
+        self.assertTrue(update_html_file(self.html_file, [li(2010, 'Old'), li(2025, 'New')]))
+        self.assertEqual(self.titles(), ['New', 'A', 'B', 'C', 'D', 'Old'])
+        self.assertEqual(self.read(), page([li(2025, 'New')] + self.existing + [li(2010, 'Old')]))
+
+    def test_several_new_entries_at_one_position_are_newest_first(self):
+        self.write(page(self.existing))
+        self.assertTrue(update_html_file(self.html_file, [li(2020, 'X'), li(2022, 'Y')]))
+        self.assertEqual(self.titles(), ['A', 'Y', 'B', 'C', 'X', 'D'])
+
+    def test_empty_one_line_list(self):
+        self.write('<body>\n    <ul id="publications-list"></ul>\n</body>\n')
+        self.assertTrue(update_html_file(self.html_file, [li(2021, 'B'), li(2023, 'A')]))
+        self.assertEqual(self.read(), '<body>\n    <ul id="publications-list">\n'
+                                      f'        {li(2023, "A")}\n        {li(2021, "B")}\n'
+                                      '    </ul>\n</body>\n')
+
+    def test_untouched_lines_stay_byte_identical(self):
+        for newline in ('\n', '\r\n'):
+            with self.subTest(newline=repr(newline)):
+                original = page(self.existing, newline).replace('<html>', '<html lang="en"> ')
+                self.write(original)
+                self.assertTrue(update_html_file(self.html_file, [li(2022, 'N'), li(2000, 'Z')]))
+
+                lines = self.read().splitlines(keepends=True)
+                added = [line for line in lines if '>N<' in line or '>Z<' in line]
+                self.assertEqual(len(added), 2)
+                self.assertTrue(all(line.endswith(newline) and not line.endswith('\r\r\n') for line in added))
+                self.assertEqual(''.join(line for line in lines if line not in added), original)
+
+    def test_missing_list_is_an_error(self):
+        self.write('<body></body>\n')
+        self.assertFalse(update_html_file(self.html_file, [li(2021, 'B')]))
+        self.assertEqual(self.read(), '<body></body>\n')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,133 +4,254 @@ Script to update publications in index.html directly from Google Scholar
 using the `scholarly` library.
 """
 
-import sys
+import os
 import re
-from scholarly import scholarly
+import sys
+import json
+import time
+import threading
 
 # Import helper functions from existing script
-try:
-    from archive.update_publications import update_html_file, generate_html_li
-except ImportError:
-    print("Error: Could not import from update_publications.py")
-    sys.exit(1)
+from archive.update_publications import update_html_file, generate_html_li
+from build_cache import write_file_atomic
+from citation_metrics import open_store, record_snapshot, build_chart
+from enrich_metadata import enrich_publications, normalize_title
 
-def fetch_and_parse_publications(scholar_id):
+# Per-author and combined lists written in multi-author mode
+OUTPUT_DIR = os.path.join('data', 'scholar')
+# Minimum pause between two Google Scholar calls, across all worker threads
+SCHOLAR_MIN_INTERVAL = 2.0
+
+class RateLimiter:
     """
-    Fetch publications from Google Scholar and parse them into the format
-    expected by generate_html_li.
+    Serializes Google Scholar access across worker threads: only one scholarly
+    call runs at a time, and each starts `min_interval` seconds after the
+    previous one finished. scholarly is a process-wide singleton and one fill()
+    pages through several requests, so the lock is held for the whole call:
+
+        with limiter:
+            author = scholarly.fill(author)
+    """
+
+    def __init__(self, min_interval=SCHOLAR_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.last_finished = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        if self.last_finished is not None:
+            delay = self.last_finished + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.last_finished = time.monotonic()
+        self.lock.release()
+        return False
+
+def save_citation_snapshot(scholar_id, author, pub_list):
+    """
+    Append the current citation counts and author indices to the time-series store
     """
-    print(f"Searching for author with ID: {scholar_id}")
     try:
+        conn = open_store()
+        try:
+            record_snapshot(conn, scholar_id, author, pub_list)
+        finally:
+            conn.close()
+        print(f"Saved citation snapshot: {author.get('citedby')} citations, h-index {author.get('hindex')}")
+    except Exception as e:
+        # Snapshots are a by-product; never block the publications update on them
+        print(f"Warning: could not save citation snapshot: {e}")
+
+def publication_group_key(pub):
+    """
+    Key shared by the copies of one paper on different authors' profiles
+    (Scholar's author_pub_id is per profile, so match on title and year)
+    """
+    bib = pub.get('bib', {})
+    return normalize_title(bib.get('title', '')), str(bib.get('pub_year') or '')
+
+def format_publication(filled_pub):
+    """
+    Turn a filled scholarly publication into the dict expected by generate_html_li
+    """
+    bib = filled_pub['bib']
+    title = bib.get('title')
+    year = bib.get('pub_year')
+    
+    authors_list = bib.get('author', '').split(' and ')
+    # Format authors: "Last, F."
+    formatted_authors = []
+    for auth in authors_list:
+        parts = auth.strip().split()
+        if not parts:
+            continue
+        if len(parts) == 1:
+            formatted_authors.append(parts[0])
+        else:
+            last_name = parts[-1]
+            initials = ''.join([p[0]+'.' for p in parts[:-1]])
+            formatted_authors.append(f"{last_name}, {initials}")
+    
+    authors_str = ", ".join(formatted_authors)
+    authors_str = authors_str.replace("&", "&amp;") # Basic escape
+    
+    # Bold Yang, Y.
+    authors_final = re.sub(r'Yang, Y\.', '<b>Yang, Y.</b>', authors_str)
+    # Also handle variations like "Yang, Y.-L." or just "Yang, Y"
+    if "<b>" not in authors_final and "Yang" in authors_str:
+         authors_final = re.sub(r'Yang, [A-ZY]\.?', '<b>Yang, Y.</b>', authors_str)
+
+    # Extract other fields
+    journal = bib.get('journal') or bib.get('conference') or bib.get('publisher') or "Unknown Journal"
+    volume = bib.get('volume')
+    issue = bib.get('number')
+    pages = bib.get('pages')
+    
+    # Scholar rarely gives a DOI; it is resolved by enrich_publications,
+    # with the publisher page (pub_url) kept as a fallback link
+    pub_url = filled_pub.get('pub_url')
+    
+    # Determine type
+    pub_type = 'journal'
+    if 'thesis' in title.lower() or 'thesis' in journal.lower():
+        pub_type = 'thesis'
+
+    return {
+        'authors': authors_final,
+        'year': int(year) if year else 0,
+        'title': title,
+        'journal': journal,
+        'volume': volume,
+        'issue': issue,
+        'pages': pages,
+        'doi_url': None,
+        'pub_url': pub_url,
+        'type': pub_type
+    }
+
+def fetch_author(scholarly, scholar_id, limiter):
+    """
+    Fetch one profile with its indices and (unfilled) publication list,
+    and save a citation snapshot for it
+    """
+    print(f"Searching for author with ID: {scholar_id}")
+    with limiter:
         author = scholarly.search_author_id(scholar_id)
-        print(f"Found author: {author.get('name')}")
-        
-        # Fill publication details (this might take a while and risks blocking if too aggressive)
-        # For now, we will try to use available data from the search result 
-        # and only fill if strictly necessary, or just rely on what's available to avoid blocking.
-        # Ideally, we should use `scholarly.fill(author, sections=['publications'])`
-        
-        print("Fetching publications list...")
-        publications_data = []
-        
-        # scholarly returns an iterator or list
-        # We need to fill the author to get the full list of publications
-        
-        # NOTE: filling all publications details might be slow and trigger rate limits.
-        # We will try to get the full list first.
-        pub_list = scholarly.fill(author, sections=['publications'])['publications']
-        
-        print(f"Found {len(pub_list)} publications. Processing...")
-        
-        for i, pub in enumerate(pub_list):
-            title = pub.get('bib', {}).get('title')
-            year = pub.get('bib', {}).get('pub_year')
-            
-            # Skip if no title or year (minimal requirements)
-            if not title:
+    print(f"Found author: {author.get('name')}")
+    
+    # 'indices' adds citedby / h-index / i10-index for the citation snapshot
+    with limiter:
+        author = scholarly.fill(author, sections=['indices', 'publications'])
+    pub_list = author['publications']
+    print(f"  {author.get('name')}: {len(pub_list)} publications")
+    
+    save_citation_snapshot(scholar_id, author, pub_list)
+    return author, pub_list
+
+def harvest_authors(scholar_ids, workers=4, limiter=None):
+    """
+    Fetch several Scholar profiles through one serialized, rate-limited connection;
+    the worker threads only overlap the local work (parsing, citation snapshots)
+    with the next request. Co-authored papers appear on every author's profile,
+    so publications are grouped first and each paper is filled (the expensive
+    request) only once.
+    
+    Returns ({scholar_id: [publication dicts]}, combined list); a shared paper is
+    the same dict in every list, with `scholar_ids` naming the authors it came from
+    """
+    # scholarly pulls in a large HTTP/Selenium dependency chain, so only load it when fetching
+    try:
+        from scholarly import scholarly
+    except ImportError:
+        print("Error: scholarly is required to fetch from Google Scholar (pip install scholarly)")
+        return {}, []
+    from concurrent.futures import ThreadPoolExecutor
+    
+    limiter = limiter or RateLimiter()
+    profiles = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {scholar_id: pool.submit(fetch_author, scholarly, scholar_id, limiter)
+                   for scholar_id in scholar_ids}
+        for scholar_id, future in futures.items():
+            try:
+                profiles[scholar_id] = future.result()[1]
+            except Exception as e:
+                print(f"Error fetching {scholar_id} from Google Scholar: {e}")
+    
+    # Group the copies of each paper across profiles, keeping first-seen order
+    groups = {}
+    for scholar_id in scholar_ids:
+        for pub in profiles.get(scholar_id, []):
+            # Skip if no title (minimal requirements)
+            if not pub.get('bib', {}).get('title'):
                 continue
-                
-            # If we need more details (journal, volume, etc.), we might need to fill the publication
-            # But this is expensive. Let's try to get what we can.
-            # 'bib' usually contains: title, pub_year, citation
-            # We might need to fill to get 'journal', 'author', etc.
-            
+            group = groups.setdefault(publication_group_key(pub), {'pub': pub, 'scholar_ids': []})
+            if scholar_id not in group['scholar_ids']:
+                group['scholar_ids'].append(scholar_id)
+    
+    total = sum(len(pubs) for pubs in profiles.values())
+    print(f"Filling {len(groups)} unique publications ({total} across {len(profiles)} profiles)...")
+    
+    def fill(group):
+        with limiter:
+            filled = scholarly.fill(group['pub'])
+        return format_publication(filled)
+    
+    combined = []
+    per_author = {scholar_id: [] for scholar_id in profiles}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(group, pool.submit(fill, group)) for group in groups.values()]
+        for group, future in futures:
+            title = group['pub']['bib']['title']
             try:
-                # Filling individual publication to get full bibtex
-                # We can add a delay if needed, but let's try without first
-                filled_pub = scholarly.fill(pub)
-                bib = filled_pub['bib']
-                
-                authors_list = bib.get('author', '').split(' and ')
-                # Format authors: "Last, F."
-                formatted_authors = []
-                for auth in authors_list:
-                    parts = auth.strip().split()
-                    if not parts:
-                        continue
-                    if len(parts) == 1:
-                        formatted_authors.append(parts[0])
-                    else:
-                        last_name = parts[-1]
-                        initials = ''.join([p[0]+'.' for p in parts[:-1]])
-                        formatted_authors.append(f"{last_name}, {initials}")
-                
-                authors_str = ", ".join(formatted_authors)
-                authors_str = authors_str.replace("&", "&amp;") # Basic escape
-                
-                # Bold Yang, Y.
-                authors_final = re.sub(r'Yang, Y\.', '<b>Yang, Y.</b>', authors_str)
-                # Also handle variations like "Yang, Y.-L." or just "Yang, Y"
-                if "<b>" not in authors_final and "Yang" in authors_str:
-                     authors_final = re.sub(r'Yang, [A-ZY]\.?', '<b>Yang, Y.</b>', authors_str)
-
-                # Extract other fields
-                journal = bib.get('journal') or bib.get('conference') or bib.get('publisher') or "Unknown Journal"
-                volume = bib.get('volume')
-                issue = bib.get('number')
-                pages = bib.get('pages')
-                
-                # DOI logic (scholarly doesn't always give DOI, we might need to infer or it might be in 'pub_url' or similar)
-                pub_url = filled_pub.get('pub_url')
-                doi_url = pub_url if pub_url else None
-                
-                # Determine type
-                pub_type = 'journal'
-                if 'thesis' in title.lower() or 'thesis' in journal.lower():
-                    pub_type = 'thesis'
-
-                pub_data = {
-                    'authors': authors_final,
-                    'year': int(year) if year else 0,
-                    'title': title,
-                    'journal': journal,
-                    'volume': volume,
-                    'issue': issue,
-                    'pages': pages,
-                    'doi_url': doi_url,
-                    'type': pub_type
-                }
-                
-                publications_data.append(pub_data)
-                print(f"  Processed: {title[:50]}...")
-                
+                pub_data = future.result()
             except Exception as e:
                 print(f"  Error processing publication '{title[:30]}...': {e}")
                 continue
+            pub_data['scholar_ids'] = group['scholar_ids']
+            combined.append(pub_data)
+            for scholar_id in group['scholar_ids']:
+                per_author[scholar_id].append(pub_data)
+            print(f"  Processed: {title[:50]}...")
+    
+    return per_author, combined
 
-        return publications_data
+def fetch_and_parse_publications(scholar_id):
+    """
+    Fetch publications from Google Scholar and parse them into the format
+    expected by generate_html_li.
+    """
+    per_author, _ = harvest_authors([scholar_id], workers=1)
+    return per_author.get(scholar_id, [])
 
-    except Exception as e:
-        print(f"Error fetching from Google Scholar: {e}")
-        return []
+def write_publication_lists(per_author, combined, output_dir=OUTPUT_DIR):
+    """
+    Save the per-author and combined publication lists as JSON
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for scholar_id, publications in per_author.items():
+        write_file_atomic(os.path.join(output_dir, f'{scholar_id}.json'),
+                          json.dumps(publications, indent=2, ensure_ascii=False) + '\n')
+    write_file_atomic(os.path.join(output_dir, 'combined.json'),
+                      json.dumps(combined, indent=2, ensure_ascii=False) + '\n')
+    print(f"Saved {len(per_author)} author lists and {len(combined)} combined publications to {output_dir}/")
 
-def main():
-    scholar_id = "xVDuszoAAAAJ"
+def main(scholar_id="xVDuszoAAAAJ", *more_ids, workers=4):
     html_file = "index.html"
+    scholar_ids = list(dict.fromkeys((scholar_id,) + more_ids))
+    
+    print(f"Starting update from Google Scholar ID: {', '.join(scholar_ids)}")
     
-    print(f"Starting update from Google Scholar ID: {scholar_id}")
+    per_author, publications_data = harvest_authors(scholar_ids, workers=min(workers, len(scholar_ids)))
+    if len(scholar_ids) > 1 and per_author:
+        write_publication_lists(per_author, publications_data)
     
-    publications_data = fetch_and_parse_publications(scholar_id)
+    # Refresh the citations chart (of the first, site-owner profile) from the snapshot saved during the fetch
+    build_chart(scholar_ids[0], html_file)
     
     if not publications_data:
         print("No publications found or error occurred.")
@@ -191,27 +312,23 @@ def main():
 
     print(f"Found {len(new_publications_data)} NEW publications to add.")
     
+    # Resolve DOIs / volume / issue / pages before rendering
+    enrich_publications(new_publications_data)
+    for pub in new_publications_data:
+        if not pub['doi_url']:
+            pub['doi_url'] = pub.get('pub_url')
+    
     # Generate HTML items
     html_items = []
     for pub_data in new_publications_data:
         html_li = generate_html_li(pub_data)
         html_items.append(html_li)
         
-    # Read existing publications HTML to pass to update_html_file
-    # (Update: update_html_file extracts existing internally? No, it takes `existing_publications_html` argument)
-    # create `existing_publications_html`
-    existing_publications_html = ""
-    ul_start = html_content.find('<ul id="publications-list">')
-    if ul_start != -1:
-        ul_end = html_content.find('</ul>', ul_start)
-        if ul_end != -1:
-            existing_publications_html = html_content[ul_start + len('<ul id="publications-list">'):ul_end]
-
     # Call update
-    if update_html_file(html_file, html_items, existing_publications_html):
+    if update_html_file(html_file, html_items):
         print("Successfully updated index.html")
     else:
         print("Failed to update index.html")
 
 if __name__ == "__main__":
-    main()
+    main(*[arg for arg in sys.argv[1:] if not arg.startswith('-')])